@@ -0,0 +1,234 @@
+"""
+Audio System - Preloaded sound bank, pooled voices and streamed room music
+"""
+
+import pygame
+import os
+import time
+from game.resources import resources, get_path
+
+SOUND_DIR = "assets/sounds"
+MUSIC_DIR = "assets/music"
+MUSIC_EXTENSIONS = (".ogg", ".mp3")
+
+# Sound effects - name -> (file, priority, min seconds between plays, volume)
+# Higher priority voices steal channels from lower ones when the pool is full
+SOUND_BANK = {
+    'jump': ("jump.wav", 1, 0.05, 0.6),
+    'sword_swing': ("sword_swing.wav", 2, 0.05, 0.7),
+    'sword_hit': ("sword_hit.wav", 3, 0.04, 0.8),
+    'player_hurt': ("player_hurt.wav", 5, 0.1, 1.0),
+    'collect_ember': ("collect_ember.wav", 2, 0.03, 0.6),
+    'collect_fragment': ("collect_fragment.wav", 4, 0.2, 0.9),
+    'hollow_death': ("hollow_death.wav", 3, 0.05, 0.8),
+    'bench_sit': ("bench_sit.wav", 4, 0.5, 0.8),
+    'menu_select': ("menu_select.wav", 1, 0.03, 0.5),
+    'pause': ("pause.wav", 1, 0.1, 0.5)
+}
+
+
+class AudioSystem:
+    """Plays sound effects on a fixed channel pool and streams music between rooms
+    
+    The device is opened and the sounds decoded by background loading jobs
+    started with start(); until then, and for a sound that isn't loaded
+    yet (or has no file), playing is simply skipped, so it never waits on
+    the device or on disk.
+    Music goes through pygame.mixer.music, which streams from the file.
+    """
+    
+    def __init__(self, channels=12, music_fade=0.8, music_volume=0.6, loader=None):
+        """Initialize audio settings (the mixer is opened by start())
+        
+        loader is an optional AssetLoader the sound bank is loaded on.
+        """
+        self.enabled = False
+        self.started = False
+        self.channel_count = channels
+        self.loader = loader
+        self.sounds = {}  # name -> Sound, filled in by the loader thread
+        self.last_played = {}  # name -> time, for rate limiting
+        self.music_fade_ms = int(music_fade * 1000)
+        self.music_volume = music_volume
+        self.music_track = None
+        self.pending_music = None  # Track asked for before the mixer was open
+        self.next_music = None  # Path to start once the current track has faded out
+        self.music_file = None  # Open archive file the current track streams from
+        self.music_switching = False
+    
+    def start(self):
+        """Open the mixer and load the sound bank in the background (once)"""
+        if self.started:
+            return
+        self.started = True
+        
+        # Opening the audio device is slow, so it never happens on the input path
+        if self.loader:
+            self.loader.submit(self.loader.start(), self.open_device, finish=self.finish_start)
+        else:
+            self.finish_start(self.open_device())
+    
+    def open_device(self):
+        """Open the audio device (on a loader thread), returns whether it opened"""
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+        except pygame.error as e:
+            print(f"Audio disabled: {e}")
+            return False
+        return True
+    
+    def finish_start(self, opened):
+        """Set up the voice pool once the device is open, then load the sound bank"""
+        if not opened:
+            return
+        
+        self.enabled = True
+        
+        # The pool is reserved, so Sound.play() elsewhere only gets the spare channels above it
+        channels = self.channel_count
+        pygame.mixer.set_num_channels(channels + 4)
+        pygame.mixer.set_reserved(channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self.voice_priority = [0] * channels
+        self.voice_start = [0.0] * channels
+        
+        if self.loader:
+            self.loader.submit(self.loader.start(), self.load_bank)
+        else:
+            self.load_bank()
+        
+        if self.pending_music:
+            self.play_music(self.pending_music)
+    
+    def load_bank(self):
+        """Decode every sound effect once (on a loader thread)"""
+        if not self.enabled:
+            return
+        
+        for name, (filename, _, _, volume) in SOUND_BANK.items():
+            path = f"{SOUND_DIR}/{filename}"
+            if not resources.exists(path):
+                continue
+            
+            try:
+                with resources.open(path) as f:
+                    sound = pygame.mixer.Sound(file=f)
+            except (pygame.error, OSError) as e:
+                print(f"Error loading sound {path}: {e}")
+                continue
+            
+            sound.set_volume(volume)
+            self.sounds[name] = sound
+    
+    def play(self, name):
+        """Play a sound effect, returns its Channel or None if it was skipped"""
+        if not self.enabled:
+            return None
+        
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+        
+        # Rate limit - a burst of the same sound plays once
+        _, priority, min_interval, _ = SOUND_BANK[name]
+        now = time.perf_counter()
+        if now - self.last_played.get(name, -min_interval) < min_interval:
+            return None
+        
+        index = self.find_voice(priority)
+        if index is None:
+            return None
+        
+        channel = self.channels[index]
+        channel.play(sound)
+        self.voice_priority[index] = priority
+        self.voice_start[index] = now
+        self.last_played[name] = now
+        return channel
+    
+    def find_voice(self, priority):
+        """Pick a free channel, or steal the lowest priority (then oldest) voice not above priority"""
+        steal = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+            
+            if self.voice_priority[i] > priority:
+                continue
+            if steal is None or (self.voice_priority[i], self.voice_start[i]) < \
+                    (self.voice_priority[steal], self.voice_start[steal]):
+                steal = i
+        
+        return steal
+    
+    def play_sound(self, sound):
+        """Play a Sound from outside the bank (cutscene audio) on a spare channel"""
+        if not self.enabled:
+            return None
+        
+        channel = pygame.mixer.find_channel(True)
+        channel.play(sound)
+        return channel
+    
+    def find_music(self, track):
+        """Path of a music track by name, or None if it has no file"""
+        for extension in MUSIC_EXTENSIONS:
+            path = f"{MUSIC_DIR}/{track}{extension}"
+            if resources.exists(path):
+                return path
+        return None
+    
+    def play_music(self, track):
+        """Fade from the current track to another (None keeps the current one)"""
+        if track is None or track == self.music_track:
+            return
+        if not self.enabled:
+            self.pending_music = track
+            return
+        
+        self.music_track = track
+        self.next_music = self.find_music(track)
+        
+        # mixer.music is a single stream, so the old track fades out before the new one fades in
+        if pygame.mixer.music.get_busy():
+            pygame.mixer.music.fadeout(self.music_fade_ms)
+            self.music_switching = True
+        else:
+            self.start_music()
+    
+    def start_music(self):
+        """Start streaming the next track with a fade in"""
+        self.music_switching = False
+        path = self.next_music
+        self.next_music = None
+        if path is None:
+            return
+        
+        try:
+            # Packed tracks stream from the archive map, loose ones from their file
+            if resources.is_packed(path):
+                self.music_file = resources.open(path)
+                pygame.mixer.music.load(self.music_file, os.path.splitext(path)[1][1:])
+            else:
+                pygame.mixer.music.load(get_path(path))
+                self.music_file = None
+            pygame.mixer.music.set_volume(self.music_volume)
+            pygame.mixer.music.play(loops=-1, fade_ms=self.music_fade_ms)
+        except pygame.error as e:
+            print(f"Error playing music {path}: {e}")
+    
+    def pause_music(self):
+        """Pause the room music (during cutscenes)"""
+        if self.enabled:
+            pygame.mixer.music.pause()
+    
+    def resume_music(self):
+        """Resume paused room music"""
+        if self.enabled:
+            pygame.mixer.music.unpause()
+    
+    def update(self):
+        """Start the next track once the previous one has faded out (call every frame)"""
+        if self.music_switching and not pygame.mixer.music.get_busy():
+            self.start_music()
@@ -29,6 +29,14 @@ class Camera:
         self.target_x = 0
         self.target_y = 0
     
+    def get_state(self):
+        """Camera position and target"""
+        return (self.x, self.y, self.target_x, self.target_y)
+    
+    def set_state(self, state):
+        """Restore a position from get_state"""
+        self.x, self.y, self.target_x, self.target_y = state
+    
     def set_bounds(self, level_width, level_height):
         """Set the level boundaries"""
         self.level_width = level_width
@@ -74,6 +82,15 @@ class Camera:
         """Get camera offset for rendering"""
         return int(self.x), int(self.y)
     
+    def visible_rect(self, margin=0):
+        """Get the area of the level in view, grown by margin on every side"""
+        x, y = self.get_offset()
+        return pygame.Rect(x - margin, y - margin, self.width + margin * 2, self.height + margin * 2)
+    
+    def cull(self, index, margin=0):
+        """Get the items of a SpatialHash that intersect the view"""
+        return index.query(self.visible_rect(margin))
+    
     def apply(self, rect):
         """Apply camera offset to a rect"""
         return pygame.Rect(rect.x - int(self.x), rect.y - int(self.y), rect.width, rect.height)
@@ -0,0 +1,135 @@
+"""
+Frame Capture - Streams rendered frames to disk on a writer thread
+"""
+
+import pygame
+import queue
+import threading
+import os
+
+
+class FrameCapture:
+    """Copies frames into a bounded queue that a background thread writes out
+    
+    Formats:
+        png - one numbered PNG per frame
+        raw - all frames appended to frames.rgb (packed RGB24), with the size
+              and frame rate in frames.txt for ffmpeg or similar tools
+    
+    With blocking set, submit waits for room in the queue so no frame is
+    lost (batch runs). Otherwise a frame is dropped when the writer is
+    behind - its number is still used, so later frames keep their place in
+    time (PNG numbering has a gap, a raw stream repeats the previous frame).
+    """
+    
+    def __init__(self, output_dir, frame_format="png", fps=60, max_queue=120, blocking=False):
+        """Initialize capture into output_dir"""
+        if frame_format not in ("png", "raw"):
+            raise ValueError(f"Unknown capture format: {frame_format}")
+        
+        self.output_dir = output_dir
+        self.frame_format = frame_format
+        self.fps = fps
+        self.blocking = blocking
+        
+        self.frames = queue.Queue(maxsize=max_queue)
+        self.thread = None
+        self.frame_count = 0
+        self.dropped = 0
+        self.size = None
+    
+    def start(self):
+        """Start the writer thread"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.thread = threading.Thread(target=self.write_frames, name="frame-capture", daemon=True)
+        self.thread.start()
+    
+    def submit(self, surface):
+        """Queue a copy of the surface's pixels, dropping the frame if the writer is behind"""
+        if self.thread is None:
+            return
+        
+        size = surface.get_size()
+        if self.size is None:
+            self.size = size
+        elif size != self.size:
+            # Raw streams can't change size mid-way
+            self.dropped += 1
+            self.frame_count += 1
+            return
+        
+        item = (self.frame_count, pygame.image.tobytes(surface, "RGB"))
+        self.frame_count += 1
+        
+        if self.blocking:
+            self.frames.put(item)
+            return
+        
+        try:
+            self.frames.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+    
+    def stop(self):
+        """Flush queued frames and stop the writer thread"""
+        if self.thread is None:
+            return
+        
+        self.frames.put(None)
+        self.thread.join()
+        self.thread = None
+        
+        if self.dropped:
+            print(f"Frame capture dropped {self.dropped} frames")
+    
+    def write_frames(self):
+        """Writer thread - save frames until stopped"""
+        raw_file = None
+        failed = False
+        next_index = 0
+        last_data = None
+        
+        while True:
+            item = self.frames.get()
+            if item is None:
+                break
+            
+            # Keep draining after an error so the game never blocks on a full queue
+            if failed:
+                continue
+            
+            index, data = item
+            try:
+                if self.frame_format == "png":
+                    image = pygame.image.frombytes(data, self.size, "RGB")
+                    pygame.image.save(image, os.path.join(self.output_dir, f"frame_{index:06d}.png"))
+                else:
+                    if raw_file is None:
+                        raw_file = open(os.path.join(self.output_dir, "frames.rgb"), "wb")
+                        self.write_raw_info()
+                    # Dropped frames are filled with the previous one to keep the stream in time
+                    if last_data is not None:
+                        for _ in range(index - next_index):
+                            raw_file.write(last_data)
+                    raw_file.write(data)
+                    last_data = data
+                    next_index = index + 1
+            except (OSError, pygame.error) as e:
+                print(f"Error writing captured frames: {e}")
+                failed = True
+        
+        if raw_file is not None:
+            # Frames dropped at the very end still count towards the stream's length
+            if not failed:
+                try:
+                    for _ in range(self.frame_count - next_index):
+                        raw_file.write(last_data)
+                except OSError as e:
+                    print(f"Error writing captured frames: {e}")
+            raw_file.close()
+    
+    def write_raw_info(self):
+        """Describe the raw stream so it can be encoded later"""
+        width, height = self.size
+        with open(os.path.join(self.output_dir, "frames.txt"), "w") as f:
+            f.write(f"format=rgb24\nwidth={width}\nheight={height}\nfps={self.fps}\n")
@@ -0,0 +1,237 @@
+"""
+Cutscene Player - Streams cutscene frames from a decoder thread, kept in time with their audio
+"""
+
+import pygame
+import queue
+import threading
+from game.resources import resources
+
+CUTSCENE_DIR = "assets/cutscenes"
+FRAME_EXTENSIONS = (".png", ".jpg", ".bmp")
+
+END = None  # Queued by the decoder after the last frame
+
+
+def to_display_format(surface):
+    """Convert a decoded frame for fast blitting (main thread only)"""
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+class ImageSequence:
+    """Cutscene stored as numbered images in assets/cutscenes/<name>/
+    
+    An optional cutscene.json gives the frame rate and an audio file
+    (relative to the cutscene folder), e.g. {"fps": 12, "audio": "flash.ogg"}.
+    """
+    
+    def __init__(self, directory):
+        """Initialize from a cutscene folder (lists files, decodes nothing)"""
+        self.directory = directory
+        self.fps = 12
+        self.audio_path = None
+        
+        info_path = f"{directory}/cutscene.json"
+        if resources.exists(info_path):
+            try:
+                info = resources.load_json(info_path)
+                self.fps = info.get('fps', self.fps)
+                if info.get('audio'):
+                    self.audio_path = f"{directory}/{info['audio']}"
+            except (OSError, ValueError) as e:
+                print(f"Error loading cutscene info: {e}")
+        
+        self.frames = [name for name in resources.list_dir(directory)
+                       if name.lower().endswith(FRAME_EXTENSIONS)]
+        self.frame_count = len(self.frames)
+    
+    def decode(self, index):
+        """Load one frame (decoder thread)"""
+        name = self.frames[index]
+        with resources.open(f"{self.directory}/{name}") as f:
+            return pygame.image.load(f, name)
+
+
+class MemoryFlash:
+    """Procedural memory flash - a cyan flash and rings spreading from a point
+    
+    Used for memory fragments that have no cutscene of their own.
+    """
+    
+    def __init__(self, center, size=(320, 180), fps=30, duration=1.5, color=(6, 182, 212)):
+        """Initialize flash around a screen position"""
+        self.center = center
+        self.size = size
+        self.fps = fps
+        self.frame_count = int(duration * fps)
+        self.color = color
+        self.audio_path = None
+    
+    def decode(self, index):
+        """Draw one frame (decoder thread)"""
+        t = index / max(1, self.frame_count - 1)
+        surface = pygame.Surface(self.size, pygame.SRCALPHA)
+        
+        # White-cyan wash that fades out quickly
+        wash = int(200 * (1 - t) ** 2)
+        surface.fill((200, 250, 255, wash))
+        
+        # Rings expanding one after another
+        for ring in range(3):
+            progress = t * 1.4 - ring * 0.2
+            if 0 < progress < 1:
+                radius = int(progress * self.size[0] * 0.6)
+                alpha = int(255 * (1 - progress))
+                pygame.draw.circle(surface, (*self.color, alpha), self.center, max(radius, 2), 2)
+        
+        return surface
+
+
+class CutscenePlayer:
+    """Plays a cutscene source without blocking the game loop
+    
+    A decoder thread fills a bounded queue (a ring of buffer_frames frames)
+    with decoded surfaces while the main thread shows them. Only the frames
+    actually shown are converted to display format, on the main thread, as
+    SDL doesn't promise convert() is safe off it. The clock
+    starts with the first decoded frame and its audio, and frames that were
+    decoded too late to show on time are dropped so picture and sound stay
+    together. The clock is game time (the frame dt), so headless captures
+    play at the same pace as a live run.
+    """
+    
+    def __init__(self, audio, buffer_frames=16):
+        """Initialize player with the shared AudioSystem"""
+        self.audio = audio
+        self.buffer_frames = buffer_frames
+        self.source = None
+        self.frames = None
+        self.stop_event = None
+        self.channel = None  # Playing cutscene audio
+        self.frame = None
+        self.frame_index = -1
+        self.elapsed = None  # Seconds since the first frame was shown
+    
+    def play(self, source):
+        """Start decoding a cutscene source (showing begins once its first frame is ready)"""
+        self.stop()
+        
+        self.source = source
+        self.frames = queue.Queue(maxsize=self.buffer_frames)
+        self.stop_event = threading.Event()
+        self.frame = None
+        self.frame_index = -1
+        self.elapsed = None
+        
+        thread = threading.Thread(target=self.decode_frames, name="cutscene-decoder", daemon=True,
+                                  args=(source, self.frames, self.stop_event))
+        thread.start()
+    
+    def decode_frames(self, source, frames, stop_event):
+        """Decoder thread - decode frames in order until the queue is full, then wait for room
+        
+        Queued items are (index, surface, sound) - the audio comes with the first frame.
+        """
+        sound = None
+        if source.audio_path and self.audio.enabled and resources.exists(source.audio_path):
+            try:
+                with resources.open(source.audio_path) as f:
+                    sound = pygame.mixer.Sound(file=f)
+            except (pygame.error, OSError) as e:
+                print(f"Error loading cutscene audio: {e}")
+        
+        for index in range(source.frame_count):
+            try:
+                surface = source.decode(index)
+            except (pygame.error, OSError) as e:
+                print(f"Error decoding cutscene frame {index}: {e}")
+                break
+            
+            while not stop_event.is_set():
+                try:
+                    frames.put((index, surface, sound if index == 0 else None), timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            if stop_event.is_set():
+                return
+        
+        while not stop_event.is_set():
+            try:
+                frames.put(END, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+    
+    def update(self, dt):
+        """Advance to the frame for the current time (never waits on the decoder)"""
+        if not self.is_playing():
+            return
+        
+        if self.elapsed is None:
+            # Keep showing the backdrop until the first frame arrives
+            try:
+                item = self.frames.get_nowait()
+            except queue.Empty:
+                return
+            if item is END:
+                self.stop()
+                return
+            
+            self.frame_index, frame, sound = item
+            self.frame = to_display_format(frame)
+            self.elapsed = 0
+            self.audio.pause_music()
+            if sound:
+                self.channel = self.audio.play_sound(sound)
+            return
+        
+        self.elapsed += dt
+        target = int(self.elapsed * self.source.fps)
+        if target >= self.source.frame_count:
+            self.stop()
+            return
+        
+        # Catch up to the clock (frames that arrive late are skipped, not slowed down for)
+        frame = None
+        while self.frame_index < target:
+            try:
+                item = self.frames.get_nowait()
+            except queue.Empty:
+                break
+            if item is END:
+                break
+            self.frame_index, frame, _ = item
+        if frame is not None:
+            self.frame = to_display_format(frame)
+    
+    def stop(self):
+        """Stop playback and the decoder"""
+        if self.source is None:
+            return
+        
+        self.stop_event.set()
+        if self.channel:
+            self.channel.stop()
+            self.channel = None
+        if self.elapsed is not None:
+            self.audio.resume_music()
+        
+        self.source = None
+        self.frames = None
+        self.frame = None
+    
+    def is_playing(self):
+        """Check if a cutscene is playing (or about to show its first frame)"""
+        return self.source is not None
+    
+    def draw(self, surface):
+        """Draw the current frame centred on the surface"""
+        if self.frame is None:
+            return
+        
+        x = (surface.get_width() - self.frame.get_width()) // 2
+        y = (surface.get_height() - self.frame.get_height()) // 2
+        surface.blit(self.frame, (x, y))
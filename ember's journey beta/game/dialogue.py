@@ -3,17 +3,29 @@ Dialogue System - Text boxes and conversation management
 """
 
 import pygame
-import json
+from game.dialogue_script import SAY, JUMP, JUMP_IF, CHOICE, SET, ADD, check_conditions
+
+MAX_SCRIPT_STEPS = 1000  # Instructions run between lines before a script is treated as stuck
 
 class DialogueSystem:
     """Manages dialogue boxes and conversations"""
     
-    def __init__(self):
-        """Initialize dialogue system"""
+    def __init__(self, fonts, store):
+        """Initialize dialogue system with the shared FontManager and DialogueStore"""
+        self.fonts = fonts
+        self.store = store  # Scripts are loaded from here when started
         self.active = False
         self.current_dialogue = None
-        self.dialogue_index = 0
-        self.dialogue_data = self.load_dialogue()
+        self.dialogue_index = 0  # Code index of the line or choice being shown
+        
+        # Script state - flags and counters set by scripts (saved with the game),
+        # and read-only game values passed in when a dialogue starts
+        self.variables = {}
+        self.game_values = {}
+        
+        # Choice menu being shown (list of (text, target)), and the selected option
+        self.choices = None
+        self.choice_index = 0
         
         # Visual
         self.box_rect = pygame.Rect(20, 120, 280, 50)  # Position on 320x180 screen
@@ -23,120 +35,242 @@ class DialogueSystem:
         
         # Text rendering
         self.font = None  # Will use pygame default
+        self.name_font = None
+        self.indicator_font = None
         self.line_spacing = 12
+        self.max_lines = 3
         self.char_delay = 0.03  # Typewriter effect
         self.char_timer = 0
         self.chars_shown = 0
         self.full_text = ""
         self.wrapped_lines = []
         
+        # Incremental layout - glyph positions are computed once per line and
+        # only newly revealed glyphs are rendered onto the persistent text surface
+        self.glyph_positions = []  # (x, y) per character of full_text, or None
+        self.text_surface = None
+        self.chars_rendered = 0
+        self.name_surface = None
+        self.indicator_surface = None
+        
         # Input
         self.can_advance = False
         self.advance_delay = 0.3
         self.advance_timer = 0
     
-    def load_dialogue(self):
-        """Load dialogue data from JSON (or hardcoded for now)"""
-        # TODO: Load from data/dialogue.json when available
-        # For now, return hardcoded dialogue
-        return {
-            "scribe": {
-                "name": "The Scribe",
-                "conversations": {
-                    "first_meeting": [
-                        "Another one awakes... Do you seek the truth, little knight?",
-                        "The archives hold secrets. But beware the Hollow Ones...",
-                        "They were once like you. Now... only echoes remain."
-                    ],
-                    "after_fragments": [
-                        "So you've found them... the fragments of what was lost.",
-                        "The path ahead is long. Perhaps... you'll be the one to restore the bells.",
-                        "Good luck, little knight. May your light never fade."
-                    ],
-                    "repeat": [
-                        "The silence grows deeper each day...",
-                        "I wonder if the bells will ever ring again..."
-                    ]
-                }
-            }
-        }
-    
-    def start_dialogue(self, npc_id, conversation="first_meeting"):
-        """Start a dialogue sequence"""
-        if npc_id in self.dialogue_data:
-            npc_data = self.dialogue_data[npc_id]
+    def start_dialogue(self, npc_id, label="start", game_values=None):
+        """Start an NPC's script at a label (loaded from the store on first use)"""
+        script = self.store.get_script(npc_id)
+        if script is None:
+            return
+        
+        # Scripts without a start section begin at their first one
+        pc = script.labels.get(label, 0 if label == "start" else None)
+        if pc is None:
+            return
+        
+        self.current_dialogue = script
+        self.game_values = game_values or {}
+        self.active = True
+        self.load_fonts()
+        self.name_surface = self.name_font.render(
+            self.current_dialogue.speaker, True, self.border_color)
+        self.run(pc)
+    
+    def run(self, pc):
+        """Step the script from pc until it shows a line or choice, or ends"""
+        code = self.current_dialogue.code
+        
+        for _ in range(MAX_SCRIPT_STEPS):
+            if pc >= len(code):
+                break
             
-            if conversation in npc_data["conversations"]:
-                self.current_dialogue = {
-                    "npc_name": npc_data["name"],
-                    "lines": npc_data["conversations"][conversation]
-                }
-                self.dialogue_index = 0
-                self.active = True
-                self.chars_shown = 0
-                self.char_timer = 0
+            instruction = code[pc]
+            op = instruction[0]
+            
+            if op == SAY:
+                self.dialogue_index = pc
+                self.choices = None
+                self.prepare_current_line()
                 self.can_advance = False
                 self.advance_timer = 0
-                self.prepare_current_line()
+                return
+            elif op == CHOICE:
+                self.dialogue_index = pc
+                self.show_choices(instruction[1])
+                return
+            elif op == JUMP:
+                pc = instruction[1]
+            elif op == JUMP_IF:
+                pc = instruction[1] if check_conditions(instruction[2], self.get_value) else pc + 1
+            elif op == SET:
+                self.variables[instruction[1]] = instruction[2]
+                pc += 1
+            elif op == ADD:
+                self.variables[instruction[1]] = self.get_value(instruction[1]) + instruction[2]
+                pc += 1
+            else:
+                break  # END
+        
+        self.close()
+    
+    def get_value(self, name):
+        """Value of a script variable or game value (0 if unset)"""
+        if name in self.variables:
+            return self.variables[name]
+        return self.game_values.get(name, 0)
+    
+    def show_choices(self, choices):
+        """Show a choice menu (option text is rendered once per script)"""
+        self.choices = choices
+        self.choice_index = 0
+        self.full_text = ""
+        self.chars_shown = 0
+        self.can_advance = True
+        
+        layouts = self.current_dialogue.layouts
+        if self.dialogue_index not in layouts:
+            layouts[self.dialogue_index] = [
+                (self.font.render(f"  {text}", True, self.text_color),
+                 self.font.render(f"> {text}", True, self.border_color))
+                for text, _ in choices
+            ]
+    
+    def is_choosing(self):
+        """Check if a choice menu is waiting for a selection"""
+        return self.active and self.choices is not None
+    
+    def move_choice(self, direction):
+        """Move the choice selection up (-1) or down (1)"""
+        self.choice_index = (self.choice_index + direction) % len(self.choices)
+    
+    def load_fonts(self):
+        """Get dialogue fonts from the shared FontManager (first use only)"""
+        if self.font:
+            return
+        
+        self.font = self.fonts.get(16)
+        self.name_font = self.fonts.get(14)
+        self.indicator_font = self.fonts.get(12)
+        self.indicator_surface = self.indicator_font.render("[Press S] ▼", True, self.text_color)
     
     def prepare_current_line(self):
         """Prepare the current dialogue line for display"""
-        if self.current_dialogue and self.dialogue_index < len(self.current_dialogue["lines"]):
-            self.full_text = self.current_dialogue["lines"][self.dialogue_index]
-            self.wrapped_lines = self.wrap_text(self.full_text, self.box_rect.width - 20)
+        if self.current_dialogue:
+            self.load_fonts()
+            self.full_text = self.current_dialogue.code[self.dialogue_index][1]
+            
+            # Layouts are kept with the cached script, so a repeat talk skips wrapping
+            layouts = self.current_dialogue.layouts
+            layout = layouts.get(self.dialogue_index)
+            if layout is None:
+                layout = self.layout_text(self.full_text, self.box_rect.width - 20)
+                layouts[self.dialogue_index] = layout
+            self.wrapped_lines, self.glyph_positions = layout
+            
+            self.clear_text_surface(self.box_rect.width - 20)
             self.chars_shown = 0
             self.char_timer = 0
     
-    def wrap_text(self, text, max_width):
-        """Wrap text to fit within max width"""
-        # Simple word wrapping
-        if not self.font:
-            self.font = pygame.font.Font(None, 16)
+    def layout_text(self, text, max_width):
+        """Wrap text and compute the position of every glyph, returns (lines, positions)"""
+        spans = self.wrap_spans(text, max_width)[:self.max_lines]
+        wrapped_lines = [text[start:end] for start, end in spans]
+        
+        # Characters outside a span (break spaces, overflow) have no position
+        glyph_positions = [None] * len(text)
+        for line_index, (start, end) in enumerate(spans):
+            x = 0
+            y = line_index * self.line_spacing
+            for i in range(start, end):
+                glyph_positions[i] = (x, y)
+                x += self.font.get_glyph(text[i])[1].width
         
-        words = text.split(' ')
-        lines = []
-        current_line = []
+        return wrapped_lines, glyph_positions
+    
+    def clear_text_surface(self, max_width):
+        """Fresh persistent text surface for a new line"""
+        size = (max_width, self.max_lines * self.line_spacing + 4)
+        if self.text_surface is None or self.text_surface.get_size() != size:
+            self.text_surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.text_surface.fill((0, 0, 0, 0))
+        self.chars_rendered = 0
+    
+    def wrap_spans(self, text, max_width):
+        """Wrap text to fit within max width, returns (start, end) index spans"""
+        # Each word is measured once from the font's glyph advances, so wrapping
+        # is linear in the text length and matches the glyph-by-glyph rendering
+        space_width = self.measure(' ')
+        spans = []
+        line_start = None
+        line_end = 0
+        line_width = 0
+        index = 0
         
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            test_width = self.font.size(test_line)[0]
+        for word in text.split(' '):
+            word_start = index
+            word_width = self.measure(word)
+            index += len(word) + 1
             
-            if test_width <= max_width:
-                current_line.append(word)
+            if line_start is None:
+                line_start, line_end, line_width = word_start, word_start + len(word), word_width
+            elif line_width + space_width + word_width <= max_width:
+                line_end = word_start + len(word)
+                line_width += space_width + word_width
             else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
+                spans.append((line_start, line_end))
+                line_start, line_end, line_width = word_start, word_start + len(word), word_width
+        
+        if line_start is not None:
+            spans.append((line_start, line_end))
+        
+        return spans
+    
+    def wrap_text(self, text, max_width):
+        """Wrap text to fit within max width"""
+        self.load_fonts()
+        return [text[start:end] for start, end in self.wrap_spans(text, max_width)]
+    
+    def measure(self, text):
+        """Width of text when rendered glyph by glyph"""
+        return self.font.size(text)[0]
+    
+    def render_new_glyphs(self):
+        """Render glyphs revealed since the last frame onto the text surface"""
+        end = min(self.chars_shown, len(self.full_text))
         
-        if current_line:
-            lines.append(' '.join(current_line))
+        for i in range(self.chars_rendered, end):
+            char = self.full_text[i]
+            position = self.glyph_positions[i]
+            if position is None or char == ' ':
+                continue
+            
+            self.font.draw_glyph(self.text_surface, char, position, self.text_color)
         
-        return lines
+        self.chars_rendered = max(self.chars_rendered, end)
     
     def advance(self):
-        """Move to next dialogue line or close"""
+        """Take the selected choice, or move to the script's next line (closes at the end)"""
+        if self.choices is not None:
+            target = self.choices[self.choice_index][1]
+            self.choices = None
+            self.run(target)
+            return
+        
         if not self.can_advance:
             # Show all text immediately
             self.chars_shown = len(self.full_text)
             self.can_advance = True
             return
         
-        self.dialogue_index += 1
-        
-        if self.dialogue_index >= len(self.current_dialogue["lines"]):
-            # End of dialogue
-            self.close()
-        else:
-            # Next line
-            self.prepare_current_line()
-            self.can_advance = False
-            self.advance_timer = 0
+        self.run(self.dialogue_index + 1)
     
     def close(self):
         """Close dialogue"""
         self.active = False
         self.current_dialogue = None
         self.dialogue_index = 0
+        self.choices = None
     
     def update(self, dt=0.016):
         """Update dialogue state"""
@@ -167,33 +301,28 @@ class DialogueSystem:
         if not self.active or not self.current_dialogue:
             return
         
-        if not self.font:
-            self.font = pygame.font.Font(None, 16)
-        
         # Draw box background
         pygame.draw.rect(surface, self.box_color, self.box_rect)
         pygame.draw.rect(surface, self.border_color, self.box_rect, 2)
         
         # Draw NPC name
-        name_font = pygame.font.Font(None, 14)
-        name_text = name_font.render(self.current_dialogue["npc_name"], True, self.border_color)
-        surface.blit(name_text, (self.box_rect.x + 10, self.box_rect.y + 5))
+        surface.blit(self.name_surface, (self.box_rect.x + 10, self.box_rect.y + 5))
         
-        # Draw dialogue text with typewriter effect
-        visible_text = self.full_text[:self.chars_shown]
-        visible_lines = self.wrap_text(visible_text, self.box_rect.width - 20)
+        # Draw choice menu in place of the text
+        if self.choices is not None:
+            options = self.current_dialogue.layouts[self.dialogue_index]
+            for i, (normal, selected) in enumerate(options):
+                option = selected if i == self.choice_index else normal
+                surface.blit(option, (self.box_rect.x + 10, self.box_rect.y + 20 + i * self.line_spacing))
+            return
         
-        y_offset = self.box_rect.y + 20
-        for line in visible_lines[:3]:  # Max 3 lines
-            line_surface = self.font.render(line, True, self.text_color)
-            surface.blit(line_surface, (self.box_rect.x + 10, y_offset))
-            y_offset += self.line_spacing
+        # Draw dialogue text with typewriter effect (only new glyphs are rendered)
+        if self.chars_rendered < self.chars_shown:
+            self.render_new_glyphs()
+        surface.blit(self.text_surface, (self.box_rect.x + 10, self.box_rect.y + 20))
         
         # Draw continue indicator
         if self.can_advance:
-            indicator_text = "[Press S] ▼"
-            indicator_font = pygame.font.Font(None, 12)
-            indicator_surface = indicator_font.render(indicator_text, True, self.text_color)
-            indicator_x = self.box_rect.right - indicator_surface.get_width() - 10
+            indicator_x = self.box_rect.right - self.indicator_surface.get_width() - 10
             indicator_y = self.box_rect.bottom - 15
-            surface.blit(indicator_surface, (indicator_x, indicator_y))
+            surface.blit(self.indicator_surface, (indicator_x, indicator_y))
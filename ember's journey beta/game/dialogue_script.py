@@ -0,0 +1,155 @@
+"""
+Dialogue Script - Compiles dialogue scripts into instruction tables
+
+A script is a list of lines, one statement each:
+    @label                          start of a section (sections end by themselves)
+    Some text to say                a line of dialogue
+    * Choice text -> label          a choice (consecutive choices form one menu)
+    -> label                        jump
+    if cond and cond -> label       jump when every condition holds
+    set name / set name = 3         set a flag or counter
+    add name / add name 2           add to a counter
+    end                             close the dialogue
+    # comment
+    \\text                           a line of dialogue that starts like a statement
+
+Conditions are `name`, `not name` or `name <op> number` (op is one of
+== != < <= > >=). Names are script flags and counters, or game values such
+as memory_fragments; unset names are 0.
+
+Scripts are compiled by the dialogue packer, so the game only ever steps
+through tables - nothing is parsed or evaluated as Python at runtime.
+"""
+
+import operator
+
+# Opcodes
+SAY = 0      # text
+JUMP = 1     # target
+JUMP_IF = 2  # target, [[name, op, value], ...]
+CHOICE = 3   # [[text, target], ...]
+SET = 4      # name, value
+ADD = 5      # name, amount
+END = 6
+
+COMPARISONS = ['==', '!=', '<', '<=', '>', '>=']
+COMPARE = [operator.eq, operator.ne, operator.lt, operator.le, operator.gt, operator.ge]
+
+
+def parse_number(text, line_number):
+    """Parse an integer operand"""
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"line {line_number}: expected a number, got '{text}'")
+
+
+def parse_condition(text, line_number):
+    """Compile one condition to [name, comparison index, value]"""
+    parts = text.split()
+    if len(parts) == 1:
+        return [parts[0], COMPARISONS.index('!='), 0]
+    if len(parts) == 2 and parts[0] == 'not':
+        return [parts[1], COMPARISONS.index('=='), 0]
+    if len(parts) == 3 and parts[1] in COMPARISONS:
+        return [parts[0], COMPARISONS.index(parts[1]), parse_number(parts[2], line_number)]
+    raise ValueError(f"line {line_number}: bad condition '{text}'")
+
+
+def split_target(text, line_number):
+    """Split 'something -> label' into (something, label)"""
+    if '->' not in text:
+        raise ValueError(f"line {line_number}: expected '-> label'")
+    body, target = text.rsplit('->', 1)
+    return body.strip(), target.strip()
+
+
+def compile_script(lines):
+    """Compile script lines, returns (code, labels) - labels map to code indexes"""
+    code = []
+    labels = {}
+    fixups = []  # (instruction, operand slot, label, line number) to resolve at the end
+    
+    def close_section():
+        """Sections never fall through into the next one"""
+        if code and code[-1][0] not in (JUMP, CHOICE, END):
+            code.append([END])
+    
+    for line_number, raw in enumerate(lines, 1):
+        line = raw.strip()
+        if not line or line.startswith('#'):
+            continue
+        
+        if line.startswith('\\'):
+            code.append([SAY, line[1:]])
+        
+        elif line.startswith('@'):
+            close_section()
+            name = line[1:].strip()
+            if name in labels:
+                raise ValueError(f"line {line_number}: label '{name}' defined twice")
+            labels[name] = len(code)
+        
+        elif line.startswith('* '):
+            text, target = split_target(line[2:], line_number)
+            if not code or code[-1][0] != CHOICE:
+                code.append([CHOICE, []])
+            option = [text, target]
+            code[-1][1].append(option)
+            fixups.append((option, 1, target, line_number))
+        
+        elif line.startswith('->'):
+            instruction = [JUMP, line[2:].strip()]
+            code.append(instruction)
+            fixups.append((instruction, 1, instruction[1], line_number))
+        
+        elif line.startswith('if '):
+            condition, target = split_target(line[3:], line_number)
+            instruction = [JUMP_IF, target,
+                           [parse_condition(part, line_number) for part in condition.split(' and ')]]
+            code.append(instruction)
+            fixups.append((instruction, 1, target, line_number))
+        
+        elif line.startswith('set '):
+            name, _, value = line[4:].partition('=')
+            code.append([SET, name.strip(), parse_number(value.strip(), line_number) if value else 1])
+        
+        elif line.startswith('add '):
+            parts = line[4:].split()
+            if not parts:
+                raise ValueError(f"line {line_number}: expected a counter name")
+            code.append([ADD, parts[0], parse_number(parts[1], line_number) if len(parts) > 1 else 1])
+        
+        elif line == 'end':
+            code.append([END])
+        
+        else:
+            code.append([SAY, line])
+    
+    close_section()
+    
+    for instruction, slot, label, line_number in fixups:
+        if label not in labels:
+            raise ValueError(f"line {line_number}: unknown label '{label}'")
+        instruction[slot] = labels[label]
+    
+    return code, labels
+
+
+def compile_conversations(conversations):
+    """Compile plain conversations ({name: [lines]}) - each becomes a section of text"""
+    code = []
+    labels = {}
+    for name, conversation in conversations.items():
+        labels[name] = len(code)
+        code.extend([SAY, line] for line in conversation)
+        code.append([END])
+    return code, labels
+
+
+def check_conditions(conditions, lookup):
+    """Check compiled conditions against a variable lookup function"""
+    for name, comparison, value in conditions:
+        if not COMPARE[comparison](lookup(name), value):
+            return False
+    return True
@@ -0,0 +1,150 @@
+"""
+Dialogue Store - Indexed, lazily loaded NPC profiles and dialogue scripts
+
+Dialogue is written in data/dialogue.json and packed with
+    python -m game.dialogue_store
+which compiles every script (see dialogue_script.py) and writes the compiled
+tables back to back into a packed file, plus a small index of byte offsets
+into it. The game only reads the index, and then each NPC's script the
+first time someone talks to them.
+"""
+
+import json
+import sys
+from collections import OrderedDict
+from game.dialogue_script import compile_script, compile_conversations
+from game.resources import resources, get_path
+
+DIALOGUE_SOURCE_PATH = "data/dialogue.json"
+DIALOGUE_INDEX_PATH = "data/dialogue.idx"
+DIALOGUE_TEXT_PATH = "data/dialogue.txt"
+INDEX_VERSION = 2
+
+DEFAULT_NPC_COLOR = (150, 150, 150)
+
+
+class DialogueScript:
+    """One NPC's compiled script, plus line layouts once the dialogue box has wrapped them"""
+    
+    def __init__(self, speaker, code, labels):
+        self.speaker = speaker
+        self.code = code      # Instruction table, see dialogue_script.py
+        self.labels = labels  # Section name -> code index
+        self.layouts = {}     # Code index of a SAY -> (wrapped lines, glyph positions)
+
+
+class DialogueStore:
+    """Looks up NPC profiles and dialogue scripts through the dialogue index"""
+    
+    def __init__(self, index_path=DIALOGUE_INDEX_PATH, text_path=DIALOGUE_TEXT_PATH, cache_size=8):
+        """Initialize store (nothing is read until first use)"""
+        self.index_path = index_path
+        self.text_path = text_path
+        self.cache_size = cache_size
+        self.index = None
+        self.scripts = OrderedDict()  # dialogue id -> DialogueScript
+    
+    def load_index(self):
+        """Read the index on first use"""
+        if self.index is not None:
+            return self.index
+        
+        self.index = {'npcs': {}, 'scripts': {}}
+        if not resources.exists(self.index_path):
+            print(f"Dialogue index not found: {self.index_path}")
+            return self.index
+        
+        try:
+            index = resources.load_json(self.index_path)
+            if index.get('version') != INDEX_VERSION:
+                raise ValueError(f"unsupported index version {index.get('version')} (repack dialogue)")
+            self.index = index
+        except (OSError, ValueError) as e:
+            print(f"Error loading dialogue index: {e}")
+        
+        return self.index
+    
+    def get_npc(self, npc_id):
+        """Profile for an NPC - name, dialogue id and color"""
+        profile = self.load_index()['npcs'].get(npc_id, {})
+        return {
+            'name': profile.get('name', npc_id),
+            'dialogue_id': profile.get('dialogue_id', npc_id),
+            'color': tuple(profile.get('color', DEFAULT_NPC_COLOR))
+        }
+    
+    def get_script(self, dialogue_id):
+        """Get a compiled script, reading it from the packed file if it isn't cached"""
+        cached = self.scripts.get(dialogue_id)
+        if cached is not None:
+            self.scripts.move_to_end(dialogue_id)
+            return cached
+        
+        entry = self.load_index()['scripts'].get(dialogue_id)
+        if entry is None:
+            return None
+        
+        try:
+            with resources.open(self.text_path) as f:
+                f.seek(entry['offset'])
+                data = json.loads(f.read(entry['length']).decode('utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"Error loading dialogue {dialogue_id}: {e}")
+            return None
+        
+        script = DialogueScript(entry['speaker'], data['code'], data['labels'])
+        self.scripts[dialogue_id] = script
+        if len(self.scripts) > self.cache_size:
+            self.scripts.popitem(last=False)
+        
+        return script
+
+
+def build_dialogue_pack(source_path=DIALOGUE_SOURCE_PATH, index_path=DIALOGUE_INDEX_PATH,
+                        text_path=DIALOGUE_TEXT_PATH):
+    """Compile dialogue.json into the index and packed files the game reads"""
+    with open(get_path(source_path), 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    
+    parts = []
+    offset = 0
+    scripts = {}
+    
+    for dialogue_id, data in source.get('dialogue', {}).items():
+        # A full script, or plain conversations (one section of text each)
+        try:
+            if 'script' in data:
+                code, labels = compile_script(data['script'])
+            else:
+                code, labels = compile_conversations(data.get('conversations', {}))
+        except ValueError as e:
+            raise ValueError(f"{dialogue_id}: {e}")
+        
+        encoded = json.dumps({'code': code, 'labels': labels},
+                             ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        scripts[dialogue_id] = {
+            'speaker': data.get('name', dialogue_id),
+            'offset': offset,
+            'length': len(encoded)
+        }
+        parts.append(encoded)
+        offset += len(encoded)
+    
+    index = {
+        'version': INDEX_VERSION,
+        'npcs': source.get('npcs', {}),
+        'scripts': scripts
+    }
+    
+    with open(get_path(text_path), 'wb') as f:
+        f.write(b"".join(parts))
+    with open(get_path(index_path), 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    
+    return len(parts), offset
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DIALOGUE_SOURCE_PATH
+    count, size = build_dialogue_pack(source)
+    print(f"Packed {count} scripts ({size} bytes) into {DIALOGUE_TEXT_PATH}")
@@ -12,6 +12,7 @@ class Enemy:
         """Initialize enemy"""
         self.rect = pygame.Rect(x, y, 16, 24)
         self.variant = variant
+        self.spawn_id = None  # Index in the level's spawn list
         
         # Stats based on variant
         self.setup_stats()
@@ -24,6 +25,7 @@ class Enemy:
         
         # AI State
         self.state = "patrol"  # patrol, chase, attack, idle
+        self.lod_dt = 0  # Time owed while updates were skipped off-screen
         self.facing_right = True
         
         # Patrol behavior
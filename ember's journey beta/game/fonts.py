@@ -0,0 +1,148 @@
+"""
+Font System - Shared font loading, glyph atlases and cached text rendering
+"""
+
+import pygame
+import time
+from collections import OrderedDict
+from game.resources import resources
+
+
+class BitmapFont:
+    """A font baked into glyph atlases, rendering strings by blitting glyph rects
+    
+    Nothing is rendered up front - the first string that uses new characters
+    bakes them together into one atlas, so startup only pays for the glyphs
+    the first screen shows.
+    """
+    
+    def __init__(self, font, cache_size=128):
+        """Wrap a loaded pygame Font"""
+        self.font = font
+        self.height = font.get_height()
+        self.linesize = font.get_linesize()
+        
+        # Glyphs are baked in white and tinted per string
+        self.glyphs = {}  # char -> (source surface, source rect)
+        self.bake_time = 0  # Seconds spent baking (startup profile)
+        
+        # Whole-string surfaces, least recently used first
+        self.cache_size = cache_size
+        self.string_cache = OrderedDict()
+    
+    def bake_atlas(self, chars):
+        """Render chars into a single atlas surface"""
+        start = time.perf_counter()
+        rendered = [(char, self.font.render(char, True, (255, 255, 255))) for char in chars]
+        width = sum(glyph.get_width() for _, glyph in rendered)
+        atlas = pygame.Surface((max(1, width), self.height), pygame.SRCALPHA)
+        
+        x = 0
+        for char, glyph in rendered:
+            atlas.blit(glyph, (x, 0))
+            self.glyphs[char] = (atlas, pygame.Rect(x, 0, glyph.get_width(), glyph.get_height()))
+            x += glyph.get_width()
+        
+        self.bake_time += time.perf_counter() - start
+        return atlas
+    
+    def get_glyph(self, char):
+        """Get (source surface, rect) for a char, baking it on first use if not in the atlas"""
+        glyph = self.glyphs.get(char)
+        if glyph is None:
+            surface = self.font.render(char, True, (255, 255, 255))
+            glyph = (surface, surface.get_rect())
+            self.glyphs[char] = glyph
+        return glyph
+    
+    def draw_glyph(self, surface, char, position, color):
+        """Blit one glyph onto surface in color (text revealed a character at a time)"""
+        source, rect = self.get_glyph(char)
+        target = surface.blit(source, position, rect)
+        r, g, b = color[:3]
+        surface.fill((r, g, b, 255), target, special_flags=pygame.BLEND_RGBA_MULT)
+    
+    def size(self, text):
+        """Get (width, height) of text as rendered by this font"""
+        missing = {char for char in text if char not in self.glyphs}
+        if missing:
+            self.bake_atlas(sorted(missing))
+        return sum(self.get_glyph(char)[1].width for char in text), self.height
+    
+    def get_height(self):
+        """Get font height in pixels"""
+        return self.height
+    
+    def get_linesize(self):
+        """Get recommended line spacing in pixels"""
+        return self.linesize
+    
+    def render(self, text, antialias, color):
+        """Render text (same call shape as pygame.font.Font.render)
+        
+        Glyphs are always baked antialiased. The returned surface is shared
+        through the cache and must not be modified.
+        """
+        key = (text, tuple(color))
+        surface = self.string_cache.get(key)
+        if surface is not None:
+            self.string_cache.move_to_end(key)
+            return surface
+        
+        surface = pygame.Surface(self.size(text), pygame.SRCALPHA)
+        blits = []
+        x = 0
+        for char in text:
+            source, rect = self.get_glyph(char)
+            blits.append((source, (x, 0), rect))
+            x += rect.width
+        surface.blits(blits, doreturn=False)
+        
+        # Tint the white glyphs to the requested color
+        r, g, b = color[:3]
+        surface.fill((r, g, b, 255), special_flags=pygame.BLEND_RGBA_MULT)
+        
+        self.string_cache[key] = surface
+        if len(self.string_cache) > self.cache_size:
+            self.string_cache.popitem(last=False)
+        
+        return surface
+
+
+class FontManager:
+    """Loads each font once per size and shares it between all systems"""
+    
+    PIXEL_FONT_PATH = "assets/fonts/pixel.ttf"
+    
+    def __init__(self, cache_size=128):
+        """Initialize font manager"""
+        self.cache_size = cache_size
+        self.fonts = {}  # (path, size) -> BitmapFont
+        self.load_time = 0  # Seconds spent opening fonts (startup profile)
+    
+    def has_pixel_font(self):
+        """Check if the pixel font file is available"""
+        return resources.exists(self.PIXEL_FONT_PATH)
+    
+    def get(self, size, pixel=False):
+        """Get a shared BitmapFont, loading it on first request
+        
+        pixel selects assets/fonts/pixel.ttf, otherwise pygame's default font
+        is used. Raises pygame.error or OSError if the font can't be loaded.
+        """
+        path = self.PIXEL_FONT_PATH if pixel else None
+        key = (path, size)
+        
+        font = self.fonts.get(key)
+        if font is None:
+            start = time.perf_counter()
+            font = BitmapFont(pygame.font.Font(resources.open(path) if path else None, size),
+                              self.cache_size)
+            self.fonts[key] = font
+            self.load_time += time.perf_counter() - start
+        
+        return font
+    
+    def get_load_time(self):
+        """Seconds spent opening fonts and baking glyphs so far"""
+        return self.load_time + sum(font.bake_time for font in self.fonts.values())
@@ -0,0 +1,245 @@
+"""
+Input System - Maps keyboard and gamepad input to game actions
+"""
+
+import pygame
+import json
+import os
+import time
+
+# Default keyboard bindings - action -> keys
+DEFAULT_KEYS = {
+    'left': [pygame.K_a, pygame.K_LEFT],
+    'right': [pygame.K_d, pygame.K_RIGHT],
+    'up': [pygame.K_w, pygame.K_UP],
+    'down': [pygame.K_s, pygame.K_DOWN],
+    'jump': [pygame.K_SPACE, pygame.K_w],
+    'attack': [pygame.K_j, pygame.K_z],
+    'interact': [pygame.K_s, pygame.K_DOWN],
+    'confirm': [pygame.K_RETURN, pygame.K_SPACE],
+    'pause': [pygame.K_ESCAPE],
+    'map': [pygame.K_m],
+    'fullscreen': [pygame.K_F11]
+}
+
+# Default gamepad bindings - action -> buttons (common Xbox-style layout)
+DEFAULT_BUTTONS = {
+    'jump': [0],      # A
+    'confirm': [0],   # A
+    'pause': [7],     # Start
+    'attack': [2],    # X
+    'interact': [3],  # Y
+    'map': [6]        # Back
+}
+
+# How long a press is remembered if it can't happen yet (seconds)
+BUFFER_WINDOWS = {
+    'jump': 0.15,  # Pressed just before landing
+    'attack': 0.1  # Pressed just before the previous swing ends
+}
+
+STICK_DEADZONE = 0.5
+
+
+class InputPress:
+    """One press this frame - every action the pressed key or button is bound to"""
+    
+    def __init__(self, actions, timestamp):
+        self.actions = actions
+        self.time = timestamp
+    
+    def __contains__(self, action):
+        return action in self.actions
+
+
+class InputSystem:
+    """Drains the event queue into per-frame action presses and tracks held actions"""
+    
+    def __init__(self):
+        """Initialize input with the default bindings"""
+        self.key_bindings = {action: list(keys) for action, keys in DEFAULT_KEYS.items()}
+        self.button_bindings = {action: list(buttons) for action, buttons in DEFAULT_BUTTONS.items()}
+        self.key_actions = {}     # key -> frozenset of actions
+        self.button_actions = {}  # button -> frozenset of actions
+        self.build_lookup()
+        
+        # Presses this frame, in the order they happened
+        self.presses = []
+        
+        # Buffered presses - action -> press time
+        self.buffered = {}
+        
+        # Connected gamepads - instance id -> Joystick
+        self.joysticks = {}
+        self.stick_direction = (0, 0)
+        self.hat_direction = (0, 0)
+        
+        if not pygame.joystick.get_init():
+            pygame.joystick.init()
+    
+    def build_lookup(self):
+        """Rebuild key/button -> actions tables from the bindings"""
+        key_actions = {}
+        for action, keys in self.key_bindings.items():
+            for key in keys:
+                key_actions.setdefault(key, set()).add(action)
+        self.key_actions = {key: frozenset(actions) for key, actions in key_actions.items()}
+        
+        button_actions = {}
+        for action, buttons in self.button_bindings.items():
+            for button in buttons:
+                button_actions.setdefault(button, set()).add(action)
+        self.button_actions = {button: frozenset(actions) for button, actions in button_actions.items()}
+    
+    def rebind(self, action, keys=None, buttons=None):
+        """Replace the keys and/or gamepad buttons bound to an action"""
+        if keys is not None:
+            self.key_bindings[action] = list(keys)
+        if buttons is not None:
+            self.button_bindings[action] = list(buttons)
+        self.build_lookup()
+    
+    def load_bindings(self, filepath):
+        """Load bindings from a JSON file (key names as shown by pygame.key.name)"""
+        if not os.path.exists(filepath):
+            return
+        
+        try:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+            
+            for action, names in data.get('keys', {}).items():
+                self.key_bindings[action] = [pygame.key.key_code(name) for name in names]
+            for action, buttons in data.get('buttons', {}).items():
+                self.button_bindings[action] = [int(button) for button in buttons]
+        
+        except (OSError, ValueError) as e:
+            print(f"Error loading controls: {e}")
+        
+        self.build_lookup()
+    
+    def save_bindings(self, filepath):
+        """Save bindings to a JSON file"""
+        data = {
+            'keys': {action: [pygame.key.name(key) for key in keys]
+                     for action, keys in self.key_bindings.items()},
+            'buttons': self.button_bindings
+        }
+        
+        try:
+            os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+            with open(filepath, 'w') as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"Error saving controls: {e}")
+    
+    def poll(self):
+        """Drain the event queue - returns the non-input events (QUIT, window events...)"""
+        self.presses = []
+        other_events = []
+        
+        for event in pygame.event.get():
+            timestamp = time.perf_counter()
+            
+            if event.type == pygame.KEYDOWN:
+                actions = self.key_actions.get(event.key)
+                if actions:
+                    self.presses.append(InputPress(actions, timestamp))
+            
+            elif event.type == pygame.JOYBUTTONDOWN:
+                actions = self.button_actions.get(event.button)
+                if actions:
+                    self.presses.append(InputPress(actions, timestamp))
+            
+            elif event.type == pygame.JOYHATMOTION:
+                self.hat_direction = event.value
+                self.press_direction(event.value[0], -event.value[1], timestamp)
+            
+            elif event.type == pygame.JOYAXISMOTION:
+                self.handle_axis(event, timestamp)
+            
+            elif event.type == pygame.JOYDEVICEADDED:
+                joystick = pygame.joystick.Joystick(event.device_index)
+                self.joysticks[joystick.get_instance_id()] = joystick
+            
+            elif event.type == pygame.JOYDEVICEREMOVED:
+                self.joysticks.pop(event.instance_id, None)
+                self.stick_direction = (0, 0)
+                self.hat_direction = (0, 0)
+            
+            elif event.type not in (pygame.KEYUP, pygame.JOYBUTTONUP):
+                other_events.append(event)
+        
+        return other_events
+    
+    def handle_axis(self, event, timestamp):
+        """Turn left stick movement into a held direction and edge presses"""
+        if event.axis not in (0, 1):
+            return
+        
+        value = event.value
+        step = 0 if abs(value) < STICK_DEADZONE else (1 if value > 0 else -1)
+        x, y = self.stick_direction
+        
+        if event.axis == 0 and step != x:
+            self.stick_direction = (step, y)
+            self.press_direction(step, 0, timestamp)
+        elif event.axis == 1 and step != y:
+            self.stick_direction = (x, step)
+            self.press_direction(0, step, timestamp)
+    
+    def press_direction(self, x, y, timestamp):
+        """Record directional presses (screen space, y down) for menu navigation"""
+        if x:
+            self.presses.append(InputPress(frozenset(['left' if x < 0 else 'right']), timestamp))
+        if y:
+            self.presses.append(InputPress(frozenset(['up' if y < 0 else 'down']), timestamp))
+    
+    def is_held(self, action):
+        """Check if an action is currently held on the keyboard or gamepad"""
+        keys = pygame.key.get_pressed()
+        if any(keys[key] for key in self.key_bindings.get(action, ())):
+            return True
+        
+        for joystick in self.joysticks.values():
+            for button in self.button_bindings.get(action, ()):
+                if button < joystick.get_numbuttons() and joystick.get_button(button):
+                    return True
+        
+        # Stick and d-pad directions
+        x = self.stick_direction[0] or self.hat_direction[0]
+        y = self.stick_direction[1] or -self.hat_direction[1]
+        return ((action == 'left' and x < 0) or (action == 'right' and x > 0) or
+                (action == 'up' and y < 0) or (action == 'down' and y > 0))
+    
+    def get_move_direction(self):
+        """Horizontal movement from held input (-1 left, 0 none, 1 right)"""
+        if self.is_held('left'):
+            return -1
+        if self.is_held('right'):
+            return 1
+        return 0
+    
+    def buffer(self, action, timestamp):
+        """Remember a press so it can still happen shortly after"""
+        self.buffered[action] = timestamp
+    
+    def is_buffered(self, action):
+        """Check if an action was pressed within its buffer window"""
+        timestamp = self.buffered.get(action)
+        if timestamp is None:
+            return False
+        
+        if time.perf_counter() - timestamp > BUFFER_WINDOWS.get(action, 0):
+            del self.buffered[action]
+            return False
+        
+        return True
+    
+    def consume(self, action):
+        """Use up a buffered press"""
+        self.buffered.pop(action, None)
+    
+    def clear_buffer(self):
+        """Drop all buffered presses (state changes, level loads)"""
+        self.buffered.clear()
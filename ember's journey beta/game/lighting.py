@@ -0,0 +1,148 @@
+"""
+Lighting System - Darkness layer with cached glow sprites and baked static lights
+"""
+
+import pygame
+import numpy as np
+
+
+class LightingSystem:
+    """Composites a light map over the scene with additive lights and a multiply pass"""
+    
+    def __init__(self, view_width, view_height, ambient=(90, 90, 115), chunk_size=256):
+        """Initialize lighting for a view size"""
+        self.view_width = view_width
+        self.view_height = view_height
+        self.ambient = ambient
+        self.chunk_size = chunk_size
+        self.enabled = True
+        
+        # Light map resolution divisor (1 = full, 2 = half...)
+        self.divisor = 1
+        
+        # Light map the scene is multiplied with (and its upscale target at lower resolutions)
+        self.light_map = self.make_surface((view_width, view_height))
+        self.scaled_map = None
+        
+        # Radial gradient sprites per (radius, color)
+        self.sprite_cache = {}
+        
+        # Static lights baked at level load - (cx, cy) -> additive chunk surface
+        self.static_lights = []
+        self.static_chunks = {}
+    
+    def make_surface(self, size):
+        """Create an opaque surface in display format when a display exists"""
+        surface = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+    
+    def set_resolution(self, divisor):
+        """Render the light map at 1/divisor resolution (light blits cost 1/divisor^2)"""
+        if divisor == self.divisor:
+            return
+        
+        self.divisor = divisor
+        self.light_map = self.make_surface((self.view_width // divisor, self.view_height // divisor))
+        self.scaled_map = self.make_surface((self.view_width, self.view_height)) if divisor > 1 else None
+        self.bake_static_lights(self.static_lights)
+    
+    def get_static_state(self):
+        """Baked static lights (chunks are never modified after baking)"""
+        return (self.divisor, self.static_lights, self.static_chunks)
+    
+    def set_static_state(self, state):
+        """Restore baked static lights, rebaking if the resolution changed since"""
+        divisor, lights, chunks = state
+        if divisor == self.divisor:
+            self.static_lights = lights
+            self.static_chunks = chunks
+        else:
+            self.bake_static_lights(lights)
+    
+    def get_light_sprite(self, radius, color):
+        """Get a radial gradient sprite (cached per radius and color)"""
+        key = (radius, tuple(color[:3]))
+        sprite = self.sprite_cache.get(key)
+        
+        if sprite is None:
+            # Quadratic falloff from the center to the edge
+            coords = np.arange(radius * 2, dtype=np.float32) - radius + 0.5
+            distance = np.sqrt(coords[:, None] ** 2 + coords[None, :] ** 2) / radius
+            intensity = np.clip(1.0 - distance, 0.0, 1.0) ** 2
+            
+            pixels = intensity[:, :, None] * np.array(color[:3], dtype=np.float32)
+            sprite = pygame.surfarray.make_surface(pixels.astype(np.uint8))
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            
+            self.sprite_cache[key] = sprite
+        
+        return sprite
+    
+    def bake_static_lights(self, lights):
+        """Bake lights that never move into per-chunk additive surfaces
+        
+        lights is an iterable of (x, y, radius, color) in world coordinates.
+        """
+        self.static_lights = list(lights)
+        self.static_chunks = {}
+        divisor = self.divisor
+        size = self.chunk_size // divisor
+        
+        # Chunks are in light map space (world / divisor)
+        for x, y, radius, color in self.static_lights:
+            radius = max(1, radius // divisor)
+            sprite = self.get_light_sprite(radius, color)
+            left, top = int(x) // divisor - radius, int(y) // divisor - radius
+            
+            # Add the sprite to every chunk it overlaps
+            for cx in range(left // size, (left + radius * 2 - 1) // size + 1):
+                for cy in range(top // size, (top + radius * 2 - 1) // size + 1):
+                    chunk = self.static_chunks.get((cx, cy))
+                    if chunk is None:
+                        chunk = self.make_surface((size, size))
+                        chunk.fill((0, 0, 0))
+                        self.static_chunks[(cx, cy)] = chunk
+                    chunk.blit(sprite, (left - cx * size, top - cy * size),
+                               special_flags=pygame.BLEND_RGB_ADD)
+    
+    def draw(self, surface, camera_x, camera_y, lights=()):
+        """Darken the scene and add static and dynamic lights
+        
+        lights is an iterable of dynamic (x, y, radius, color) in world coordinates.
+        """
+        if not self.enabled:
+            return
+        
+        light_map = self.light_map
+        light_map.fill(self.ambient)
+        
+        # Light map space (world / divisor)
+        divisor = self.divisor
+        map_x, map_y = camera_x // divisor, camera_y // divisor
+        map_width, map_height = light_map.get_size()
+        
+        # Baked static chunks in view
+        size = self.chunk_size // divisor
+        for cx in range(map_x // size, (map_x + map_width - 1) // size + 1):
+            for cy in range(map_y // size, (map_y + map_height - 1) // size + 1):
+                chunk = self.static_chunks.get((cx, cy))
+                if chunk is not None:
+                    light_map.blit(chunk, (cx * size - map_x, cy * size - map_y),
+                                   special_flags=pygame.BLEND_RGB_ADD)
+        
+        # Dynamic lights
+        for x, y, radius, color in lights:
+            radius = max(1, radius // divisor)
+            sprite = self.get_light_sprite(radius, color)
+            light_map.blit(sprite, (int(x) // divisor - radius - map_x, int(y) // divisor - radius - map_y),
+                           special_flags=pygame.BLEND_RGB_ADD)
+        
+        if self.scaled_map is not None:
+            # Nearest scaling - smoothscale costs more than the whole full-resolution pass
+            pygame.transform.scale(light_map, self.scaled_map.get_size(), self.scaled_map)
+            light_map = self.scaled_map
+        
+        surface.blit(light_map, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
@@ -0,0 +1,137 @@
+"""
+Asset Loader - Loading jobs on a thread pool, finished on the main thread in per-frame slices
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LoadJob:
+    """One background job and the main-thread step that finishes it"""
+    
+    def __init__(self, future, finish):
+        self.future = future
+        self.finish = finish  # Called with the job's result, may be a generator of slices
+        self.steps = None     # Running finish generator
+        self.done = False
+
+
+class LoadBatch:
+    """Jobs loaded together behind one loading screen"""
+    
+    def __init__(self, on_done=None):
+        self.jobs = []
+        self.on_done = on_done  # Called on the main thread once every job is finished
+    
+    def get_progress(self):
+        """Fraction loaded (a job counts half once read, the rest once finished)"""
+        if not self.jobs:
+            return 0.0
+        
+        loaded = 0
+        for job in self.jobs:
+            if job.done:
+                loaded += 2
+            elif job.future.done():
+                loaded += 1
+        return loaded / (len(self.jobs) * 2)
+    
+    def is_done(self):
+        """Check if every job is finished"""
+        return all(job.done for job in self.jobs)
+
+
+class AssetLoader:
+    """Reads and decodes assets on worker threads while the game keeps drawing
+    
+    Workers only do what is safe off the main thread (file reads, parsing,
+    image decoding). Each job's finish step runs on the main thread, in
+    submit order, within a time budget per frame - a finish step that
+    returns a generator is resumed one slice at a time (display-format
+    conversion, one surface per slice). With blocking=True every batch is
+    finished as soon as update() sees it, so headless runs stay reproducible.
+    """
+    
+    def __init__(self, workers=4, frame_budget=0.004, blocking=False):
+        """Initialize the worker pool"""
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="loader")
+        self.frame_budget = frame_budget
+        self.blocking = blocking
+        self.batches = []
+    
+    def start(self, on_done=None):
+        """Start a batch of jobs"""
+        batch = LoadBatch(on_done)
+        self.batches.append(batch)
+        return batch
+    
+    def submit(self, batch, function, *args, finish=None):
+        """Run function(*args) on a worker, then finish(result) on the main thread"""
+        job = LoadJob(self.pool.submit(function, *args), finish)
+        batch.jobs.append(job)
+        return job
+    
+    def update(self):
+        """Finish loaded jobs until this frame's budget is spent (call every frame)"""
+        deadline = time.perf_counter() + self.frame_budget
+        
+        for batch in self.batches[:]:
+            if self.finish_batch(batch, deadline):
+                self.batches.remove(batch)
+                if batch.on_done:
+                    batch.on_done()
+    
+    def finish_batch(self, batch, deadline):
+        """Finish a batch's loaded jobs in order, returns True once all of them are finished"""
+        for job in batch.jobs:
+            if job.done:
+                continue
+            if not self.blocking and (not job.future.done() or time.perf_counter() > deadline):
+                return False
+            self.finish_job(job, deadline)
+            if not job.done:
+                return False
+        return True
+    
+    def finish_job(self, job, deadline):
+        """Run a job's finish step - at least one slice, then more while there is time"""
+        if job.steps is None:
+            try:
+                result = job.future.result()
+            except Exception as e:
+                print(f"Error in loading job: {e}")
+                job.done = True
+                return
+            
+            steps = job.finish(result) if job.finish else None
+            if not hasattr(steps, '__next__'):
+                job.done = True
+                return
+            job.steps = steps
+        
+        while True:
+            try:
+                next(job.steps)
+            except StopIteration:
+                job.done = True
+                return
+            if not self.blocking and time.perf_counter() > deadline:
+                return
+    
+    def cancel(self, batch):
+        """Drop a batch - its finish steps and on_done never run (reads already running are ignored)"""
+        if batch in self.batches:
+            self.batches.remove(batch)
+        
+        for job in batch.jobs:
+            job.future.cancel()
+            if job.steps is not None:
+                job.steps.close()
+    
+    def is_loading(self):
+        """Check if any batch is still loading"""
+        return bool(self.batches)
+    
+    def shutdown(self):
+        """Stop the workers (queued jobs are dropped)"""
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -3,15 +3,82 @@ Menu System - Main menu, pause menu, and other menus
 """
 
 import pygame
-import os
+
+
+class MenuRenderer:
+    """Bakes static menu layers once and recomposes only when the menu changes"""
+    
+    def __init__(self, menu):
+        """Initialize renderer for a Menu"""
+        self.menu = menu
+        self.static_layers = {}  # (menu_type, size) -> Surface
+        self.frame = None
+        self.frame_key = None
+        self.presented_key = None
+    
+    def get_key(self, size):
+        """Everything the composed menu frame depends on"""
+        return (self.menu.menu_type, self.menu.selected_index, tuple(self.menu.get_current_options()), size)
+    
+    def invalidate(self):
+        """Force the next frame to be presented again (e.g. after a display change)"""
+        self.presented_key = None
+    
+    def needs_redraw(self, size):
+        """Check if the menu frame changed since it was last drawn"""
+        return self.presented_key != self.get_key(size)
+    
+    def get_static_layer(self, size):
+        """Get the baked background layer for the current menu type"""
+        key = (self.menu.menu_type, size)
+        layer = self.static_layers.get(key)
+        
+        if layer is None:
+            width, height = size
+            if self.menu.menu_type == "MAIN":
+                # Main menu is fully opaque
+                layer = pygame.Surface(size)
+                self.menu.draw_main_menu(layer, width, height)
+            elif self.menu.menu_type == "SETTINGS":
+                layer = pygame.Surface(size)
+                self.menu.draw_settings_menu(layer, width, height)
+            else:
+                # Overlay menus are transparent - the game dims its frozen backdrop
+                layer = pygame.Surface(size, pygame.SRCALPHA)
+                self.menu.draw_pause_menu(layer, width, height)
+            self.static_layers[key] = layer
+        
+        return layer
+    
+    def get_frame(self, size):
+        """Get the composed menu frame, re-rendering options only on change"""
+        key = self.get_key(size)
+        
+        if key != self.frame_key:
+            width, height = size
+            self.frame = self.get_static_layer(size).copy()
+            
+            if self.menu.menu_type == "MAIN":
+                self.menu.draw_menu_options(self.frame, width, height, 95)
+            elif self.menu.menu_type == "SETTINGS":
+                self.menu.draw_menu_options(self.frame, width, height, 45, spacing=17)
+            else:
+                box_y = (height - self.menu.pause_box_size[1]) // 2
+                self.menu.draw_menu_options(self.frame, width, height, box_y + 40)
+            
+            self.frame_key = key
+        
+        self.presented_key = key
+        return self.frame
+
 
 class Menu:
     """Main menu and pause menu system"""
     
-    def __init__(self):
-        """Initialize menu"""
+    def __init__(self, fonts):
+        """Initialize menu with the shared FontManager"""
         # Try to load pixel font, fallback to pygame default
-        self.pixel_font = None
+        self.fonts = fonts
         self.load_fonts()
         
         # Menu state
@@ -30,21 +97,27 @@ class Menu:
         # Menu options
         self.main_menu_options = ["Start Game", "Settings", "Quit"]
         self.pause_menu_options = ["Resume", "Restart", "Main Menu", "Quit"]
+        self.settings_options = ["Back"]  # Filled in by the game from its settings
+        
+        # Pause menu box
+        self.pause_box_size = (140, 120)
+        self.pause_dim_alpha = 200  # Applied to the gameplay backdrop by the game
         
         # Animation
         self.title_pulse = 0
         self.selector_offset = 0
         
+        # Cached layered rendering
+        self.renderer = MenuRenderer(self)
+        
     def load_fonts(self):
         """Load pixel fonts"""
-        font_path = "assets/fonts/pixel.ttf"
-        
-        if os.path.exists(font_path):
+        if self.fonts.has_pixel_font():
             try:
-                self.title_font = pygame.font.Font(font_path, 18)  # Much smaller!
-                self.menu_font = pygame.font.Font(font_path, 10)
-                self.small_font = pygame.font.Font(font_path, 8)
-            except:
+                self.title_font = self.fonts.get(18, pixel=True)  # Much smaller!
+                self.menu_font = self.fonts.get(10, pixel=True)
+                self.small_font = self.fonts.get(8, pixel=True)
+            except (pygame.error, OSError):
                 self.use_default_fonts()
         else:
             self.use_default_fonts()
@@ -52,15 +125,16 @@ class Menu:
     def use_default_fonts(self):
         """Use pygame's default fonts as fallback"""
         # Pygame's default font - using smaller sizes for cleaner look
-        self.title_font = pygame.font.Font(None, 36)
-        self.menu_font = pygame.font.Font(None, 20)
-        self.small_font = pygame.font.Font(None, 14)
+        self.title_font = self.fonts.get(36)
+        self.menu_font = self.fonts.get(20)
+        self.small_font = self.fonts.get(14)
     
     def show(self, menu_type="MAIN"):
         """Show menu"""
         self.active = True
         self.menu_type = menu_type
         self.selected_index = 0
+        self.renderer.invalidate()
     
     def hide(self):
         """Hide menu"""
@@ -82,6 +156,8 @@ class Menu:
             return self.main_menu_options
         elif self.menu_type == "PAUSE":
             return self.pause_menu_options
+        elif self.menu_type == "SETTINGS":
+            return self.settings_options
         return []
     
     def get_selected_option(self):
@@ -99,21 +175,24 @@ class Menu:
         # Minimal animation - just a subtle pulse
         self.title_pulse += dt * 2
     
+    def needs_redraw(self, size):
+        """Check if the menu looks different from the last drawn frame"""
+        return self.renderer.needs_redraw(size)
+    
+    def invalidate(self):
+        """Force a redraw on the next frame"""
+        self.renderer.invalidate()
+    
     def draw(self, surface):
         """Draw menu"""
-        if not self.active:
+        if not self.active or self.menu_type not in ("MAIN", "PAUSE", "SETTINGS"):
             return
         
-        width = surface.get_width()
-        height = surface.get_height()
-        
-        if self.menu_type == "MAIN":
-            self.draw_main_menu(surface, width, height)
-        elif self.menu_type == "PAUSE":
-            self.draw_pause_menu(surface, width, height)
+        # One blit of the cached frame (static layers + current selection)
+        surface.blit(self.renderer.get_frame(surface.get_size()), (0, 0))
     
     def draw_main_menu(self, surface, width, height):
-        """Draw main menu"""
+        """Draw main menu static layer (options are drawn by the renderer)"""
         # Full background
         surface.fill(self.bg_color)
         
@@ -134,31 +213,34 @@ class Menu:
         subtitle_rect = subtitle_surface.get_rect(center=(width // 2, 65))
         surface.blit(subtitle_surface, subtitle_rect)
         
-        # Draw menu options - start much lower
-        self.draw_menu_options(surface, width, height, 95)
-        
         # Draw controls hint at bottom
         hint_text = "W/S: Navigate  |  SPACE: Select  |  F11: Fullscreen"
         hint_surface = self.small_font.render(hint_text, True, (120, 120, 120))
         hint_rect = hint_surface.get_rect(center=(width // 2, height - 15))
         surface.blit(hint_surface, hint_rect)
     
-    def draw_pause_menu(self, surface, width, height):
-        """Draw pause menu overlay"""
-        # Semi-transparent overlay
-        overlay = pygame.Surface((width, height))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
-        surface.blit(overlay, (0, 0))
+    def draw_settings_menu(self, surface, width, height):
+        """Draw settings menu static layer (options are drawn by the renderer)"""
+        surface.fill(self.bg_color)
+        
+        title_surface = self.menu_font.render("SETTINGS", True, self.selected_color)
+        title_rect = title_surface.get_rect(center=(width // 2, 22))
+        surface.blit(title_surface, title_rect)
         
+        hint_text = "A/D: Change  |  ESC: Back"
+        hint_surface = self.small_font.render(hint_text, True, (120, 120, 120))
+        hint_rect = hint_surface.get_rect(center=(width // 2, height - 15))
+        surface.blit(hint_surface, hint_rect)
+    
+    def draw_pause_menu(self, surface, width, height):
+        """Draw pause menu box onto a per-pixel alpha layer (options are drawn by the renderer)"""
         # Menu box - centered and properly sized
-        box_width = 140
-        box_height = 120
+        box_width, box_height = self.pause_box_size
         box_x = (width - box_width) // 2
         box_y = (height - box_height) // 2
         
-        # Draw box background
-        pygame.draw.rect(surface, self.box_color, (box_x, box_y, box_width, box_height))
+        # Draw box background (opaque over the overlay)
+        pygame.draw.rect(surface, self.box_color[:3], (box_x, box_y, box_width, box_height))
         pygame.draw.rect(surface, self.border_color, (box_x, box_y, box_width, box_height), 2)
         
         # Title
@@ -166,11 +248,8 @@ class Menu:
         title_surface = self.menu_font.render(title_text, True, self.selected_color)
         title_rect = title_surface.get_rect(center=(width // 2, box_y + 18))
         surface.blit(title_surface, title_rect)
-        
-        # Draw menu options - start below title
-        self.draw_menu_options(surface, width, height, box_y + 40)
     
-    def draw_menu_options(self, surface, width, height, start_y):
+    def draw_menu_options(self, surface, width, height, start_y, spacing=25):
         """Draw menu options with selection"""
         options = self.get_current_options()
         
@@ -182,7 +261,7 @@ class Menu:
             
             # Render text - clean and simple
             text_surface = self.menu_font.render(option, True, color)
-            text_rect = text_surface.get_rect(center=(width // 2, start_y + i * 25))
+            text_rect = text_surface.get_rect(center=(width // 2, start_y + i * spacing))
             
             # Draw text only (no shadow for cleaner look)
             surface.blit(text_surface, text_rect)
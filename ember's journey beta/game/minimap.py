@@ -0,0 +1,256 @@
+"""
+Minimap System - Downsampled room maps, exploration fog and the world map
+"""
+
+import pygame
+import numpy as np
+import hashlib
+import json
+import os
+from game.resources import resources, get_path
+
+# Tile type -> map code (0 is empty space)
+TILE_CODES = {'floor': 1, 'wall': 2, 'platform': 3}
+OTHER_TILE_CODE = 4
+
+# Map color per code
+MAP_PALETTE = np.array([
+    (40, 44, 70),     # Empty (explored)
+    (120, 135, 160),  # Floor
+    (90, 105, 130),   # Wall
+    (150, 170, 195),  # Platform
+    (130, 130, 130)   # Other
+], dtype=np.uint8)
+
+
+class RoomMap:
+    """One room rasterised at one pixel per tile, revealed as it is explored"""
+    
+    def __init__(self, name, grid, map_position):
+        """Initialize from a (cols, rows) grid of tile codes"""
+        self.name = name
+        self.grid = grid
+        self.map_position = map_position  # In tiles on the world map
+        self.cols, self.rows = grid.shape
+        
+        self.colors = MAP_PALETTE[grid]  # (cols, rows, 3)
+        self.explored = np.zeros(grid.shape, dtype=bool)
+        
+        # Unexplored cells stay fully transparent
+        self.surface = pygame.Surface((self.cols, self.rows), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 0))
+    
+    def reveal(self, cell_x, cell_y, radius):
+        """Reveal cells within radius of a cell, returns True if anything new was revealed"""
+        x0, x1 = max(0, cell_x - radius), min(self.cols, cell_x + radius + 1)
+        y0, y1 = max(0, cell_y - radius), min(self.rows, cell_y + radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            return False
+        
+        xs = np.arange(x0, x1)[:, None] - cell_x
+        ys = np.arange(y0, y1)[None, :] - cell_y
+        disk = xs * xs + ys * ys <= radius * radius
+        
+        new_cells = disk & ~self.explored[x0:x1, y0:y1]
+        if not new_cells.any():
+            return False
+        
+        self.explored[x0:x1, y0:y1] |= new_cells
+        
+        # Write only the newly revealed pixels
+        rgb = pygame.surfarray.pixels3d(self.surface)
+        rgb[x0:x1, y0:y1][new_cells] = self.colors[x0:x1, y0:y1][new_cells]
+        del rgb
+        alpha = pygame.surfarray.pixels_alpha(self.surface)
+        alpha[x0:x1, y0:y1][new_cells] = 255
+        del alpha
+        
+        return True
+
+
+class MinimapSystem:
+    """Keeps a RoomMap per visited room and draws the minimap and world map"""
+    
+    CACHE_DIR = get_path("cache/minimap")
+    
+    def __init__(self, tile_size=16, reveal_radius=6, scale=2):
+        """Initialize minimap"""
+        self.tile_size = tile_size
+        self.reveal_radius = reveal_radius
+        self.scale = scale
+        
+        self.rooms = {}  # level name -> RoomMap
+        self.current_room = None
+        self.player_cell = None
+        
+        # Minimap window (top-right, under the counters)
+        self.window_rect = pygame.Rect(320 - 68, 34, 64, 32)
+        self.window_surface = pygame.Surface(self.window_rect.size, pygame.SRCALPHA)
+        self.scaled_room = None
+        self.window_dirty = True
+        
+        # World map overlay, recomposed only when exploration changed
+        self.world_map_surface = None
+        self.world_map_dirty = True
+    
+    def enter_room(self, world):
+        """Switch to the room the world just loaded, rasterising it on first visit"""
+        name = world.current_level
+        room = self.rooms.get(name)
+        
+        if room is None:
+            grid = self.load_grid(world)
+            room = RoomMap(name, grid, self.get_map_position(world, grid))
+            self.rooms[name] = room
+            self.world_map_dirty = True
+        
+        self.current_room = room
+        self.player_cell = None
+        self.scaled_room = None
+        self.window_dirty = True
+    
+    def get_map_position(self, world, grid):
+        """Room position on the world map (from level data, or next to the known rooms)"""
+        if world.map_position is not None:
+            return tuple(world.map_position)
+        
+        right = 0
+        for room in self.rooms.values():
+            right = max(right, room.map_position[0] + room.cols + 2)
+        return (right, 0)
+    
+    def rasterise(self, world):
+        """Build the (cols, rows) grid of tile codes for a room"""
+        size = self.tile_size
+        cols = max(1, -(-world.level_width // size))
+        rows = max(1, -(-world.level_height // size))
+        grid = np.zeros((cols, rows), dtype=np.uint8)
+        
+        for tile in world.tiles:
+            x0, y0 = tile['x'] // size, tile['y'] // size
+            x1 = -(-(tile['x'] + tile['width']) // size)
+            y1 = -(-(tile['y'] + tile['height']) // size)
+            grid[max(0, x0):x1, max(0, y0):y1] = TILE_CODES.get(tile.get('type'), OTHER_TILE_CODE)
+        
+        return grid
+    
+    def get_cache_key(self, world):
+        """Key identifying a room's tile layout (file stamp, or a hash of the tiles)"""
+        stamp = resources.get_stamp(world.level_path) if world.level_path else None
+        if stamp:
+            return f"{world.level_path}:{stamp}:{self.tile_size}"
+        
+        layout = json.dumps([world.level_width, world.level_height, world.tiles], sort_keys=True)
+        return hashlib.sha1(layout.encode('utf-8')).hexdigest() + f":{self.tile_size}"
+    
+    def load_grid(self, world):
+        """Get a room's grid from the on-disk cache, rasterising and storing it on a miss"""
+        key = self.get_cache_key(world)
+        path = os.path.join(self.CACHE_DIR, f"{world.current_level}.npz")
+        
+        try:
+            with np.load(path) as cached:
+                if str(cached['key']) == key:
+                    return cached['grid']
+        except (OSError, KeyError, ValueError):
+            pass
+        
+        grid = self.rasterise(world)
+        
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            np.savez(path, key=np.array(key), grid=grid)
+        except OSError as e:
+            print(f"Error writing minimap cache: {e}")
+        
+        return grid
+    
+    def update(self, player_rect):
+        """Reveal around the player when they move into a new cell"""
+        room = self.current_room
+        if room is None:
+            return
+        
+        cell = (player_rect.centerx // self.tile_size, player_rect.centery // self.tile_size)
+        if cell == self.player_cell:
+            return
+        
+        self.player_cell = cell
+        self.window_dirty = True
+        
+        if room.reveal(cell[0], cell[1], self.reveal_radius):
+            self.scaled_room = None
+            self.world_map_dirty = True
+    
+    def compose_window(self):
+        """Redraw the minimap window around the player"""
+        room = self.current_room
+        if self.scaled_room is None:
+            self.scaled_room = pygame.transform.scale(
+                room.surface, (room.cols * self.scale, room.rows * self.scale))
+        
+        width, height = self.window_rect.size
+        player_x = (self.player_cell[0] + 0.5) * self.scale
+        player_y = (self.player_cell[1] + 0.5) * self.scale
+        
+        # Center on the player, clamped to the room
+        offset_x = min(max(0, int(player_x - width / 2)), max(0, self.scaled_room.get_width() - width))
+        offset_y = min(max(0, int(player_y - height / 2)), max(0, self.scaled_room.get_height() - height))
+        
+        surface = self.window_surface
+        surface.fill((0, 0, 0, 160))
+        surface.blit(self.scaled_room, (-offset_x, -offset_y))
+        pygame.draw.rect(surface, (255, 190, 120),
+                         (int(player_x) - offset_x - 1, int(player_y) - offset_y - 1, 2, 2))
+        pygame.draw.rect(surface, (100, 150, 200), surface.get_rect(), 1)
+        
+        self.window_dirty = False
+    
+    def draw(self, surface):
+        """Draw the minimap window (a single blit on steady frames)"""
+        if self.current_room is None or self.player_cell is None:
+            return
+        
+        if self.window_dirty or self.scaled_room is None:
+            self.compose_window()
+        
+        surface.blit(self.window_surface, self.window_rect)
+    
+    def compose_world_map(self, width, height):
+        """Compose every explored room into the world map overlay"""
+        self.world_map_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.world_map_surface.fill((0, 0, 0, 0))
+        
+        scale = self.scale
+        current = self.current_room
+        
+        # Center the map on the current room
+        center_x = (current.map_position[0] + current.cols / 2) * scale
+        center_y = (current.map_position[1] + current.rows / 2) * scale
+        origin_x = int(width / 2 - center_x)
+        origin_y = int(height / 2 - center_y)
+        
+        for room in self.rooms.values():
+            if not room.explored.any():
+                continue
+            
+            scaled = pygame.transform.scale(room.surface, (room.cols * scale, room.rows * scale))
+            position = (origin_x + room.map_position[0] * scale, origin_y + room.map_position[1] * scale)
+            self.world_map_surface.blit(scaled, position)
+            
+            border_color = (6, 182, 212) if room is current else (100, 150, 200)
+            pygame.draw.rect(self.world_map_surface, border_color,
+                             (position[0] - 1, position[1] - 1, scaled.get_width() + 2, scaled.get_height() + 2), 1)
+        
+        self.world_map_dirty = False
+    
+    def draw_world_map(self, surface):
+        """Draw the world map overlay (a single blit unless exploration changed)"""
+        if self.current_room is None:
+            return
+        
+        if self.world_map_dirty or self.world_map_surface is None \
+                or self.world_map_surface.get_size() != surface.get_size():
+            self.compose_world_map(surface.get_width(), surface.get_height())
+        
+        surface.blit(self.world_map_surface, (0, 0))
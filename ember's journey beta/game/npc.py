@@ -7,13 +7,13 @@ import pygame
 class NPC:
     """Non-player character class"""
     
-    def __init__(self, x, y, npc_id="scribe"):
-        """Initialize NPC"""
+    def __init__(self, x, y, npc_id="scribe", profile=None):
+        """Initialize NPC (profile comes from the DialogueStore)"""
         self.rect = pygame.Rect(x, y, 24, 32)  # Slightly larger than player
         self.npc_id = npc_id
         
         # Setup based on NPC type
-        self.setup_npc()
+        self.setup_npc(profile or {})
         
         # Animation
         self.animation_frame = 0
@@ -24,13 +24,11 @@ class NPC:
         self.interaction_range = 30
         self.can_interact = True
     
-    def setup_npc(self):
-        """Setup NPC properties based on ID"""
-        if self.npc_id == "scribe":
-            self.name = "The Scribe"
-            self.dialogue_id = "scribe"
-            self.color = (59, 130, 246)  # Blue
-        # Add more NPCs here
+    def setup_npc(self, profile):
+        """Setup NPC properties from its profile (data/dialogue.json)"""
+        self.name = profile.get('name', self.npc_id)
+        self.dialogue_id = profile.get('dialogue_id', self.npc_id)
+        self.color = tuple(profile.get('color', (150, 150, 150)))
     
     def is_near_player(self, player):
         """Check if player is close enough to interact"""
@@ -0,0 +1,148 @@
+"""
+Frame Pacing - Frame rate limiting and frame time statistics
+"""
+
+import time
+import math
+from collections import deque
+
+PACING_MODES = ("vsync", "limit", "uncapped")
+
+
+class FramePacer:
+    """Paces the main loop and measures how evenly frames are delivered
+    
+    Modes:
+        vsync    - the display's buffer swap paces the loop (falls back to
+                   limit if the driver ignores the vsync request)
+        limit    - hybrid limiter: sleep until just before the deadline, then spin
+        uncapped - no waiting at all
+    
+    While idle (menus, pause) the loop is capped at idle_fps using sleep only,
+    so menus don't keep a core busy. In vsync mode a frame that skipped the
+    buffer swap is capped at target_fps the same way, since nothing else
+    would wait.
+    """
+    
+    def __init__(self, mode="limit", target_fps=60, idle_fps=30, spin_time=0.002,
+                 max_dt=0.1, history=120):
+        """Initialize pacer"""
+        if mode not in PACING_MODES:
+            raise ValueError(f"Unknown pacing mode: {mode}")
+        
+        self.mode = mode
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.spin_time = spin_time  # Last stretch before a deadline is spun, not slept
+        self.max_dt = max_dt        # Long stalls are clamped so physics doesn't tunnel
+        self.idle = False
+        self.presented = True  # Whether the last frame swapped buffers
+        
+        self.last_time = None
+        self.deadline = None
+        
+        # Recent frame times in seconds
+        self.frame_times = deque(maxlen=history)
+        
+        # Busy frames sampled to confirm vsync is really pacing the loop
+        self.vsync_samples = [] if mode == "vsync" else None
+    
+    def set_idle(self, idle):
+        """Switch the power-saving cap on or off"""
+        self.idle = idle
+    
+    def set_presented(self, presented):
+        """Record whether this frame swapped buffers (vsync only waits on a swap)"""
+        self.presented = presented
+    
+    def tick(self):
+        """Wait for the next frame and return the elapsed time in seconds"""
+        now = time.perf_counter()
+        
+        # The first frame starts at once - there is nothing to pace it against yet
+        if self.last_time is None:
+            self.last_time = now
+            return 1.0 / (self.target_fps or 60)
+        
+        if self.idle and self.idle_fps:
+            self.wait_until(self.next_deadline(now, 1.0 / self.idle_fps), spin=False)
+        elif self.mode == "limit" and self.target_fps:
+            self.wait_until(self.next_deadline(now, 1.0 / self.target_fps), spin=True)
+        elif self.mode == "vsync" and not self.presented and self.target_fps:
+            self.wait_until(self.next_deadline(now, 1.0 / self.target_fps), spin=False)
+        else:
+            self.deadline = None
+        
+        now = time.perf_counter()
+        frame_time = now - self.last_time
+        self.last_time = now
+        self.frame_times.append(frame_time)
+        
+        if self.vsync_samples is not None and not self.idle and self.presented:
+            self.check_vsync(frame_time)
+        
+        return min(frame_time, self.max_dt)
+    
+    def next_deadline(self, now, period):
+        """Advance the frame deadline by one period (resyncing after a missed frame)"""
+        if self.deadline is None or now - self.deadline > period:
+            self.deadline = now + period
+        else:
+            # Stepping from the previous deadline keeps the average rate exact
+            self.deadline += period
+        return self.deadline
+    
+    def wait_until(self, deadline, spin):
+        """Sleep until shortly before deadline, then optionally spin for precision"""
+        remaining = deadline - time.perf_counter()
+        sleep_time = remaining - self.spin_time if spin else remaining
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+        
+        if spin:
+            while time.perf_counter() < deadline:
+                pass
+    
+    def check_vsync(self, frame_time):
+        """Fall back to the limiter if swaps aren't actually waiting for vsync"""
+        self.vsync_samples.append(frame_time)
+        if len(self.vsync_samples) < 60:
+            return
+        
+        mean = sum(self.vsync_samples) / len(self.vsync_samples)
+        self.vsync_samples = None
+        
+        # Even a 144 Hz display takes longer than this per swap
+        if mean < 1.0 / 240:
+            print("VSync not honored by the display driver, using the frame limiter")
+            self.mode = "limit"
+    
+    def reset(self):
+        """Forget timing history (after a level load, so its slow frames aren't caught up on)"""
+        self.last_time = None
+        self.deadline = None
+        self.frame_times.clear()
+    
+    def get_mean(self):
+        """Mean frame time in seconds"""
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+    
+    def get_stats(self):
+        """Frame time statistics over the recent history (times in milliseconds)"""
+        count = len(self.frame_times)
+        if count == 0:
+            return {'fps': 0.0, 'mean_ms': 0.0, 'stddev_ms': 0.0, 'min_ms': 0.0, 'max_ms': 0.0, 'frames': 0}
+        
+        mean = self.get_mean()
+        variance = sum((t - mean) ** 2 for t in self.frame_times) / count
+        
+        return {
+            'fps': 1.0 / mean if mean > 0 else 0.0,
+            'mean_ms': mean * 1000,
+            'stddev_ms': math.sqrt(variance) * 1000,
+            'min_ms': min(self.frame_times) * 1000,
+            'max_ms': max(self.frame_times) * 1000,
+            'frames': count
+        }
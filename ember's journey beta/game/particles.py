@@ -0,0 +1,165 @@
+"""
+Particle System - Ember bursts, hit sparks, dust and death dissolves
+"""
+
+import pygame
+import numpy as np
+
+# Particle presets: speed range, emit angle range (radians, 0 = right, -pi/2 = up),
+# lifetime range, gravity (px/s^2), drag (velocity kept per second), size in pixels
+PARTICLE_TYPES = {
+    'ember': {
+        'colors': [(255, 200, 80), (249, 115, 22)],
+        'speed': (20, 70), 'angle': (-np.pi, 0), 'life': (0.4, 0.9),
+        'gravity': -30, 'drag': 0.3, 'size': 1
+    },
+    'spark': {
+        'colors': [(255, 255, 255), (255, 230, 150)],
+        'speed': (60, 140), 'angle': (-np.pi, np.pi), 'life': (0.1, 0.25),
+        'gravity': 0, 'drag': 0.05, 'size': 1
+    },
+    'dust': {
+        'colors': [(120, 120, 130), (90, 90, 100)],
+        'speed': (5, 25), 'angle': (-np.pi, 0), 'life': (0.3, 0.6),
+        'gravity': 40, 'drag': 0.2, 'size': 1
+    },
+    'dissolve': {
+        'colors': [(153, 27, 27), (90, 15, 15)],
+        'speed': (5, 25), 'angle': (-np.pi, np.pi), 'life': (0.4, 0.8),
+        'gravity': -40, 'drag': 0.4, 'size': 2
+    },
+    'glow': {
+        'colors': [(255, 255, 255)],
+        'speed': (2, 8), 'angle': (-np.pi * 0.75, -np.pi * 0.25), 'life': (0.5, 1.0),
+        'gravity': -10, 'drag': 0.5, 'size': 1
+    }
+}
+
+
+class ParticleSystem:
+    """Structure-of-arrays particle pool updated in one vectorized step"""
+    
+    def __init__(self, capacity=10000):
+        """Initialize particle arrays"""
+        self.capacity = capacity
+        self.count = 0
+        self.density = 1.0  # Share of requested particles actually emitted (quality setting)
+        self.rng = None  # Created on the first emit (numpy.random is slow to import)
+        
+        # Live particles are packed into [0:count]
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.drag = np.ones(capacity, dtype=np.float32)
+        self.size = np.ones(capacity, dtype=np.uint8)
+    
+    def clear(self):
+        """Remove all particles"""
+        self.count = 0
+    
+    def emit(self, x, y, kind, amount, color=None, spread=0):
+        """Emit particles of a preset kind at (x, y), optionally overriding the color"""
+        preset = PARTICLE_TYPES[kind]
+        if self.rng is None:
+            self.rng = np.random.default_rng()
+        rng = self.rng
+        
+        # Scale by density, rounding randomly so small bursts still average out
+        if self.density < 1.0:
+            scaled = amount * self.density
+            amount = int(scaled) + (rng.random() < scaled - int(scaled))
+        
+        amount = min(amount, self.capacity - self.count)
+        if amount <= 0:
+            return
+        
+        s = slice(self.count, self.count + amount)
+        
+        self.position[s, 0] = x + rng.uniform(-spread, spread, amount)
+        self.position[s, 1] = y + rng.uniform(-spread, spread, amount)
+        
+        angle = rng.uniform(*preset['angle'], amount)
+        speed = rng.uniform(*preset['speed'], amount)
+        self.velocity[s, 0] = np.cos(angle) * speed
+        self.velocity[s, 1] = np.sin(angle) * speed
+        
+        life = rng.uniform(*preset['life'], amount)
+        self.life[s] = life
+        self.max_life[s] = life
+        
+        if color is not None:
+            self.color[s] = color[:3]
+        else:
+            palette = np.array(preset['colors'], dtype=np.float32)
+            self.color[s] = palette[rng.integers(0, len(palette), amount)]
+        
+        self.gravity[s] = preset['gravity']
+        self.drag[s] = preset['drag']
+        self.size[s] = preset['size']
+        
+        self.count += amount
+    
+    def update(self, dt):
+        """Advance all particles and drop the dead ones"""
+        n = self.count
+        if n == 0:
+            return
+        
+        velocity = self.velocity[:n]
+        velocity[:, 1] += self.gravity[:n] * dt
+        velocity *= (self.drag[:n] ** dt)[:, None]
+        self.position[:n] += velocity * dt
+        self.life[:n] -= dt
+        
+        # Compact live particles to the front
+        alive = self.life[:n] > 0
+        live_count = int(np.count_nonzero(alive))
+        if live_count < n:
+            for array in (self.position, self.velocity, self.life, self.max_life,
+                          self.color, self.gravity, self.drag, self.size):
+                array[:live_count] = array[:n][alive]
+            self.count = live_count
+    
+    def draw(self, surface, camera_x, camera_y):
+        """Write particles straight into the surface's pixel array"""
+        n = self.count
+        if n == 0:
+            return
+        
+        width, height = surface.get_size()
+        xs = self.position[:n, 0].astype(np.int32) - camera_x
+        ys = self.position[:n, 1].astype(np.int32) - camera_y
+        
+        # Dim over the lifetime (not all the way to black, which reads as holes on lit areas)
+        fade = np.clip(self.life[:n] / self.max_life[:n], 0, 1)
+        rgb = (self.color[:n] * (0.4 + 0.6 * fade)[:, None]).astype(np.uint32)
+        
+        if surface.get_bytesize() != 4:
+            # Rare non 32-bit target: fall back to per-particle fills
+            for x, y, c, size in zip(xs, ys, rgb, self.size[:n]):
+                surface.fill(tuple(int(v) for v in c), (int(x), int(y), int(size), int(size)))
+            return
+        
+        # Map colors to the surface's pixel format in one step
+        shifts = surface.get_shifts()
+        losses = surface.get_losses()
+        mapped = ((rgb[:, 0] >> losses[0]) << shifts[0]) | \
+                 ((rgb[:, 1] >> losses[1]) << shifts[1]) | \
+                 ((rgb[:, 2] >> losses[2]) << shifts[2]) | \
+                 np.uint32(surface.get_masks()[3])
+        
+        pixels = pygame.surfarray.pixels2d(surface)
+        large = self.size[:n] > 1
+        
+        offsets = [(0, 0), (1, 0), (0, 1), (1, 1)]
+        for i, (ox, oy) in enumerate(offsets):
+            px, py = xs + ox, ys + oy
+            visible = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            if i > 0:
+                visible &= large
+            pixels[px[visible], py[visible]] = mapped[visible]
+        
+        del pixels  # Unlock the surface
@@ -47,19 +47,23 @@ class Player:
         self.color = (229, 231, 235)  # Light gray
     
     def jump(self):
-        """Make player jump"""
+        """Make player jump, returns True if the jump happened"""
         if self.on_ground and not self.is_attacking:
             self.velocity_y = self.jump_force
             self.on_ground = False
             self.animation_state = "jump"
+            return True
+        return False
     
     def attack(self):
-        """Initiate attack"""
+        """Initiate attack, returns True if the attack started"""
         if not self.is_attacking and self.on_ground:
             self.is_attacking = True
             self.attack_timer = self.attack_duration
             self.animation_state = "attack"
             self.animation_frame = 0
+            return True
+        return False
     
     def hurt(self):
         """Player takes damage"""
@@ -73,8 +77,8 @@ class Player:
             self.velocity_x = -50 if self.facing_right else 50
             self.velocity_y = -100
     
-    def update(self, dt, keys, collision_tiles):
-        """Update player state"""
+    def update(self, dt, move_direction, collision_tiles):
+        """Update player state (move_direction is -1 left, 0 none, 1 right)"""
         # Update timers
         if self.attack_timer > 0:
             self.attack_timer -= dt
@@ -89,12 +93,12 @@ class Player:
         
         # Horizontal movement (only if not attacking or hurt)
         if not self.is_attacking and not self.is_hurt:
-            if keys[pygame.K_a] or keys[pygame.K_LEFT]:
+            if move_direction < 0:
                 self.velocity_x = -self.move_speed
                 self.facing_right = False
                 if self.on_ground:
                     self.animation_state = "walk"
-            elif keys[pygame.K_d] or keys[pygame.K_RIGHT]:
+            elif move_direction > 0:
                 self.velocity_x = self.move_speed
                 self.facing_right = True
                 if self.on_ground:
@@ -0,0 +1,170 @@
+"""
+Quality Governor - Adapts rendering and simulation cost to the measured frame time
+"""
+
+import json
+import os
+
+# Quality features, each with its tiers from cheapest to best - (label, value).
+# Auto only uses the first 'auto_tiers' tiers; the rest can only be picked in Settings.
+QUALITY_FEATURES = {
+    'particles': {'label': "Particles", 'tiers': [("Low", 0.25), ("Medium", 0.5), ("High", 1.0)]},
+    'lighting': {'label': "Lighting", 'tiers': [("Low", 4), ("Medium", 2), ("High", 1)]},
+    'parallax': {'label': "Parallax", 'tiers': [("Off", 0), ("Low", 1), ("High", None)]},
+    'ai_lod': {'label': "Enemy AI", 'tiers': [("Low", 4), ("Medium", 2), ("High", 1)]},
+    'scaler': {'label': "Scaler", 'tiers': [("Fast", "half"), ("Sharp", "nearest"), ("Smooth", "scale2x")],
+               'auto_tiers': 2}
+}
+
+# Order features are stepped down in (and back up in reverse)
+SHED_ORDER = ['particles', 'lighting', 'parallax', 'ai_lod', 'scaler',
+              'particles', 'lighting', 'parallax', 'ai_lod']
+
+
+class QualityGovernor:
+    """Steps quality down when frames run over budget and back up when there's headroom
+    
+    Features can be pinned to a tier from the settings screen; the governor
+    only moves the ones left on auto.
+    """
+    
+    def __init__(self, target_fps=60, sample_count=30, shed_ratio=0.85, restore_ratio=0.55,
+                 shed_cooldown=1.0, restore_delay=4.0):
+        """Initialize governor at full quality"""
+        self.budget = 1.0 / target_fps
+        self.sample_count = sample_count
+        self.shed_ratio = shed_ratio        # Shed when work time exceeds this share of the budget
+        self.restore_ratio = restore_ratio  # Restore when work time stays below this share
+        self.shed_cooldown = shed_cooldown  # Seconds to let a change settle before shedding again
+        self.restore_delay = restore_delay  # Seconds of headroom before restoring a step
+        
+        self.pinned = {feature: None for feature in QUALITY_FEATURES}  # feature -> tier or None (auto)
+        self.shed_steps = 0  # How far down SHED_ORDER the governor has gone
+        
+        self.samples = []
+        self.cooldown = 0
+        self.headroom_time = 0
+        self.changed = True
+    
+    def get_tier(self, feature):
+        """Current tier index of a feature"""
+        if self.pinned[feature] is not None:
+            return self.pinned[feature]
+        
+        info = QUALITY_FEATURES[feature]
+        top = info.get('auto_tiers', len(info['tiers'])) - 1
+        return top - SHED_ORDER[:self.shed_steps].count(feature)
+    
+    def get(self, feature):
+        """Current value of a feature"""
+        return QUALITY_FEATURES[feature]['tiers'][self.get_tier(feature)][1]
+    
+    def get_setting_label(self, feature):
+        """Settings screen text for a feature, e.g. 'Lighting: Auto'"""
+        info = QUALITY_FEATURES[feature]
+        pinned = self.pinned[feature]
+        value = "Auto" if pinned is None else info['tiers'][pinned][0]
+        return f"{info['label']}: {value}"
+    
+    def cycle_setting(self, feature, direction=1):
+        """Step a feature's setting through Auto and its tiers"""
+        choices = [None] + list(range(len(QUALITY_FEATURES[feature]['tiers'])))
+        index = choices.index(self.pinned[feature])
+        self.pinned[feature] = choices[(index + direction) % len(choices)]
+        self.changed = True
+    
+    def update(self, dt, work_time):
+        """Feed one gameplay frame's work time (seconds, excluding presentation)"""
+        self.samples.append(work_time)
+        if len(self.samples) > self.sample_count:
+            del self.samples[0]
+        
+        if self.cooldown > 0:
+            self.cooldown -= dt
+            return
+        
+        if len(self.samples) < self.sample_count:
+            return
+        
+        # Median ignores one-off spikes like level loads
+        typical = sorted(self.samples)[len(self.samples) // 2]
+        
+        if typical > self.budget * self.shed_ratio:
+            self.headroom_time = 0
+            if self.step(-1):
+                self.cooldown = self.shed_cooldown
+                self.samples.clear()
+        elif typical < self.budget * self.restore_ratio:
+            self.headroom_time += dt
+            if self.headroom_time >= self.restore_delay:
+                self.headroom_time = 0
+                if self.step(1):
+                    self.cooldown = self.shed_cooldown
+                    self.samples.clear()
+        else:
+            # In between the thresholds nothing changes (hysteresis)
+            self.headroom_time = 0
+    
+    def step(self, direction):
+        """Shed (-1) or restore (+1) one step, skipping pinned features"""
+        steps = self.shed_steps
+        while True:
+            if direction < 0:
+                if steps >= len(SHED_ORDER):
+                    return False
+                feature = SHED_ORDER[steps]
+                steps += 1
+            else:
+                if steps <= 0:
+                    return False
+                steps -= 1
+                feature = SHED_ORDER[steps]
+            
+            if self.pinned[feature] is None:
+                break
+        
+        self.shed_steps = steps
+        self.changed = True
+        return True
+    
+    def load_settings(self, filepath):
+        """Load pinned quality levels from a JSON settings file"""
+        if not os.path.exists(filepath):
+            return
+        
+        try:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading settings: {e}")
+            return
+        
+        for feature, label in data.get('quality', {}).items():
+            if feature not in QUALITY_FEATURES:
+                continue
+            labels = [tier[0] for tier in QUALITY_FEATURES[feature]['tiers']]
+            self.pinned[feature] = labels.index(label) if label in labels else None
+        
+        self.changed = True
+    
+    def save_settings(self, filepath):
+        """Save pinned quality levels to a JSON settings file (other sections are kept)"""
+        data = {}
+        if os.path.exists(filepath):
+            try:
+                with open(filepath, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        
+        data['quality'] = {
+            feature: "Auto" if tier is None else QUALITY_FEATURES[feature]['tiers'][tier][0]
+            for feature, tier in self.pinned.items()
+        }
+        
+        try:
+            os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+            with open(filepath, 'w') as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"Error saving settings: {e}")
@@ -0,0 +1,232 @@
+"""
+Resources - Game files found relative to the game folder, or read from a packed archive
+
+Paths are written relative to the game folder with forward slashes
+("data/levels/tutorial_chamber.json"), so the game runs from any working
+directory. If assets.pak exists it is opened once and memory-mapped, and
+files are handed out as views into the map instead of being opened one by
+one. Build it with
+    python -m game.resources
+and delete it (or rebuild it) after editing loose files.
+"""
+
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVE_PATH = os.path.join(BASE_DIR, "assets.pak")
+PACKED_DIRS = ("data", "assets")
+UNPACKED_EXTENSIONS = (".md",)  # Docs stay out of the archive
+
+# Archive layout: header, file data back to back, then the index table -
+# per entry a length-prefixed UTF-8 path, data offset and size
+ARCHIVE_MAGIC = b"EMBERPAK"
+ARCHIVE_VERSION = 1
+ARCHIVE_HEADER = struct.Struct("<8sHIQ")  # magic, version, entry count, index offset
+PATH_LENGTH = struct.Struct("<H")
+ENTRY = struct.Struct("<QQ")  # offset, size
+
+
+def get_path(relative):
+    """Absolute path of a file in the game folder (for loose files and writable folders)"""
+    return os.path.join(BASE_DIR, *relative.split('/'))
+
+
+class ArchiveFile(io.RawIOBase):
+    """Read-only file over a view of the archive map - bytes are only copied when read"""
+    
+    def __init__(self, view):
+        self.view = view
+        self.position = 0
+    
+    def readable(self):
+        return True
+    
+    def seekable(self):
+        return True
+    
+    def readinto(self, buffer):
+        count = max(0, min(len(buffer), len(self.view) - self.position))
+        buffer[:count] = self.view[self.position:self.position + count]
+        self.position += count
+        return count
+    
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.view)
+        self.position = max(0, offset)
+        return self.position
+    
+    def tell(self):
+        return self.position
+
+
+class ResourceArchive:
+    """A packed archive, memory-mapped for the life of the game"""
+    
+    def __init__(self, path):
+        """Open and map the archive and read its index table"""
+        self.path = path
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.stamp = os.fstat(f.fileno()).st_mtime_ns
+        self.view = memoryview(self.map)
+        self.entries = self.read_index()  # relative path -> (offset, size)
+    
+    def read_index(self):
+        """Parse the index table at the end of the archive"""
+        magic, version, count, offset = ARCHIVE_HEADER.unpack_from(self.map, 0)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            raise ValueError(f"{self.path} is not a version {ARCHIVE_VERSION} archive")
+        
+        entries = {}
+        for _ in range(count):
+            (length,) = PATH_LENGTH.unpack_from(self.map, offset)
+            offset += PATH_LENGTH.size
+            name = bytes(self.view[offset:offset + length]).decode('utf-8')
+            offset += length
+            entries[name] = ENTRY.unpack_from(self.map, offset)
+            offset += ENTRY.size
+        
+        return entries
+    
+    def get_buffer(self, relative):
+        """Zero-copy view of a packed file"""
+        offset, size = self.entries[relative]
+        return self.view[offset:offset + size]
+
+
+class Resources:
+    """Looks files up in the archive first, then in the game folder"""
+    
+    def __init__(self, archive_path=ARCHIVE_PATH):
+        """Initialize resources (the archive is opened on first use)"""
+        self.archive_path = archive_path
+        self.archive = None
+        self.archive_checked = False
+    
+    def get_archive(self):
+        """The packed archive, or None if there isn't one"""
+        if not self.archive_checked:
+            self.archive_checked = True
+            if os.path.exists(self.archive_path):
+                try:
+                    self.archive = ResourceArchive(self.archive_path)
+                except (OSError, ValueError, struct.error) as e:
+                    print(f"Error opening archive: {e}")
+        return self.archive
+    
+    def is_packed(self, relative):
+        """Check if a file is in the archive"""
+        archive = self.get_archive()
+        return archive is not None and relative in archive.entries
+    
+    def exists(self, relative):
+        """Check if a file exists in the archive or on disk"""
+        return self.is_packed(relative) or os.path.isfile(get_path(relative))
+    
+    def is_dir(self, relative):
+        """Check if a folder exists in the archive or on disk"""
+        archive = self.get_archive()
+        prefix = relative.rstrip('/') + '/'
+        if archive is not None and any(name.startswith(prefix) for name in archive.entries):
+            return True
+        return os.path.isdir(get_path(relative))
+    
+    def list_dir(self, relative):
+        """Names of the files directly inside a folder"""
+        prefix = relative.rstrip('/') + '/'
+        names = set()
+        
+        archive = self.get_archive()
+        if archive is not None:
+            names.update(name[len(prefix):] for name in archive.entries
+                         if name.startswith(prefix) and '/' not in name[len(prefix):])
+        
+        path = get_path(relative)
+        if os.path.isdir(path):
+            names.update(name for name in os.listdir(path) if os.path.isfile(os.path.join(path, name)))
+        
+        return sorted(names)
+    
+    def open(self, relative):
+        """Open a file for binary reading (pygame.image.load, Font and Sound take these)"""
+        if self.is_packed(relative):
+            return ArchiveFile(self.archive.get_buffer(relative))
+        return open(get_path(relative), 'rb')
+    
+    def read(self, relative):
+        """Whole file contents - a zero-copy view if it's packed, otherwise bytes"""
+        if self.is_packed(relative):
+            return self.archive.get_buffer(relative)
+        with open(get_path(relative), 'rb') as f:
+            return f.read()
+    
+    def load_json(self, relative):
+        """Parse a JSON file"""
+        return json.loads(str(self.read(relative), 'utf-8'))
+    
+    def get_stamp(self, relative):
+        """Text that changes whenever the file does (for cache keys), or None if missing"""
+        if self.is_packed(relative):
+            offset, size = self.archive.entries[relative]
+            return f"pak:{self.archive.stamp}:{offset}:{size}"
+        
+        try:
+            stat = os.stat(get_path(relative))
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+# Shared by every system
+resources = Resources()
+
+
+def build_archive(output_path=ARCHIVE_PATH, folders=PACKED_DIRS):
+    """Pack the game's data and asset folders into an archive"""
+    files = []
+    for folder in folders:
+        for root, dirs, names in os.walk(get_path(folder)):
+            dirs.sort()
+            for name in sorted(names):
+                if name.lower().endswith(UNPACKED_EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                files.append((os.path.relpath(path, BASE_DIR).replace(os.sep, '/'), path))
+    
+    index = []
+    temp_path = output_path + ".tmp"
+    with open(temp_path, 'wb') as out:
+        out.write(b"\0" * ARCHIVE_HEADER.size)
+        
+        for relative, path in files:
+            with open(path, 'rb') as f:
+                data = f.read()
+            index.append((relative, out.tell(), len(data)))
+            out.write(data)
+        
+        index_offset = out.tell()
+        for relative, offset, size in index:
+            name = relative.encode('utf-8')
+            out.write(PATH_LENGTH.pack(len(name)))
+            out.write(name)
+            out.write(ENTRY.pack(offset, size))
+        
+        out.seek(0)
+        out.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION, len(index), index_offset))
+    
+    os.replace(temp_path, output_path)
+    return len(index), index_offset
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else ARCHIVE_PATH
+    count, size = build_archive(output)
+    print(f"Packed {count} files ({size} bytes) into {output}")
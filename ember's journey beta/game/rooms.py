@@ -0,0 +1,70 @@
+"""
+Room Cache - Keeps recently visited rooms alive and the rest as compact deltas
+"""
+
+from collections import OrderedDict
+
+
+class RoomState:
+    """A room as the player left it - level data, live entities and baked lights"""
+    
+    def __init__(self, world_state, light_state, enemies, npcs, collectibles, removed_spawns):
+        self.world_state = world_state
+        self.light_state = light_state
+        self.enemies = enemies
+        self.npcs = npcs
+        self.collectibles = collectibles
+        self.removed_spawns = removed_spawns
+
+
+class RoomCache:
+    """Bounded LRU of live rooms
+    
+    Rooms pushed out of the cache keep only a delta record - the spawn ids
+    removed from them (killed enemies, collected pickups) - and are rebuilt
+    from their level data on the next visit.
+    """
+    
+    def __init__(self, capacity=4):
+        """Initialize an empty cache"""
+        self.capacity = capacity
+        self.live = OrderedDict()  # level name -> RoomState, least recent first
+        self.deltas = {}           # level name -> frozenset of removed spawn ids
+    
+    def store(self, name, room):
+        """Keep a room the player is leaving"""
+        self.live[name] = room
+        self.live.move_to_end(name)
+        self.deltas.pop(name, None)
+        
+        while len(self.live) > self.capacity:
+            old_name, old_room = self.live.popitem(last=False)
+            self.compact(old_name, old_room.removed_spawns)
+    
+    def compact(self, name, removed_spawns):
+        """Record a room as its delta only"""
+        if removed_spawns:
+            self.deltas[name] = frozenset(removed_spawns)
+        else:
+            self.deltas.pop(name, None)
+    
+    def take(self, name):
+        """Remove and return a live room, or None if it isn't cached"""
+        return self.live.pop(name, None)
+    
+    def get_removed(self, name):
+        """Spawn ids removed from a room that isn't live"""
+        return self.deltas.get(name, frozenset())
+    
+    def get_all_removed(self):
+        """Removed spawn ids for every known room (for saves and checkpoints)"""
+        removed = dict(self.deltas)
+        for name, room in self.live.items():
+            if room.removed_spawns:
+                removed[name] = frozenset(room.removed_spawns)
+        return removed
+    
+    def reset(self, deltas=None):
+        """Drop live rooms and start over from delta records"""
+        self.live.clear()
+        self.deltas = {name: frozenset(ids) for name, ids in (deltas or {}).items() if ids}
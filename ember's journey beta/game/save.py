@@ -0,0 +1,195 @@
+"""
+Save System - Compact binary saves written atomically on a background thread
+"""
+
+import os
+import queue
+import struct
+import threading
+import zlib
+
+SAVE_MAGIC = b"EMBR"
+SAVE_VERSION = 2  # Version 1 saves (no dialogue flags) still load
+
+# Header: magic, version, health, max health, soul embers, memory fragments,
+# has bench, bench x, bench y
+HEADER = struct.Struct("<4sHhhIHBii")
+COUNT = struct.Struct("<H")
+FLAG_VALUE = struct.Struct("<i")
+CHECKSUM = struct.Struct("<I")
+
+
+class SaveData:
+    """Everything written to a save slot"""
+    
+    def __init__(self, level="tutorial_chamber", health=3, max_health=3, soul_embers=0,
+                 memory_fragments=0, bench=None, rooms=None, flags=None):
+        self.level = level
+        self.health = health
+        self.max_health = max_health
+        self.soul_embers = soul_embers
+        self.memory_fragments = memory_fragments
+        self.bench = bench  # (x, y) of the bench saved at, or None
+        self.rooms = rooms if rooms is not None else {}  # level name -> set of removed spawn ids
+        self.flags = flags if flags is not None else {}  # dialogue flag/counter name -> value
+
+
+def write_string(parts, text):
+    """Append a length-prefixed UTF-8 string"""
+    data = text.encode('utf-8')
+    parts.append(COUNT.pack(len(data)))
+    parts.append(data)
+
+
+def read_string(data, offset):
+    """Read a length-prefixed UTF-8 string, returns (text, new offset)"""
+    (length,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+
+def encode_save(save):
+    """Serialise SaveData to bytes (little-endian, CRC32 trailer)"""
+    bench_x, bench_y = save.bench if save.bench else (0, 0)
+    parts = [HEADER.pack(SAVE_MAGIC, SAVE_VERSION, save.health, save.max_health,
+                         save.soul_embers, save.memory_fragments,
+                         1 if save.bench else 0, bench_x, bench_y)]
+    write_string(parts, save.level)
+    
+    # Per-room state - spawn ids removed from each room (killed, collected)
+    parts.append(COUNT.pack(len(save.rooms)))
+    for name, removed in save.rooms.items():
+        write_string(parts, name)
+        ids = sorted(removed)
+        parts.append(COUNT.pack(len(ids)))
+        parts.append(struct.pack(f"<{len(ids)}H", *ids))
+    
+    # Dialogue flags and counters
+    parts.append(COUNT.pack(len(save.flags)))
+    for name, value in save.flags.items():
+        write_string(parts, name)
+        parts.append(FLAG_VALUE.pack(value))
+    
+    body = b"".join(parts)
+    return body + CHECKSUM.pack(zlib.crc32(body))
+
+
+def decode_save(data):
+    """Parse bytes written by encode_save, raises ValueError if invalid"""
+    if len(data) < HEADER.size + CHECKSUM.size:
+        raise ValueError("save file is truncated")
+    
+    body = data[:-CHECKSUM.size]
+    (checksum,) = CHECKSUM.unpack_from(data, len(body))
+    if zlib.crc32(body) != checksum:
+        raise ValueError("save file is corrupt")
+    
+    try:
+        (magic, version, health, max_health, soul_embers, memory_fragments,
+         has_bench, bench_x, bench_y) = HEADER.unpack_from(body, 0)
+        if magic != SAVE_MAGIC:
+            raise ValueError("not a save file")
+        if version not in (1, SAVE_VERSION):
+            raise ValueError(f"unsupported save version {version}")
+        
+        offset = HEADER.size
+        level, offset = read_string(body, offset)
+        
+        rooms = {}
+        (room_count,) = COUNT.unpack_from(body, offset)
+        offset += COUNT.size
+        for _ in range(room_count):
+            name, offset = read_string(body, offset)
+            (id_count,) = COUNT.unpack_from(body, offset)
+            offset += COUNT.size
+            rooms[name] = set(struct.unpack_from(f"<{id_count}H", body, offset))
+            offset += 2 * id_count
+        
+        flags = {}
+        if version >= 2:
+            (flag_count,) = COUNT.unpack_from(body, offset)
+            offset += COUNT.size
+            for _ in range(flag_count):
+                name, offset = read_string(body, offset)
+                (flags[name],) = FLAG_VALUE.unpack_from(body, offset)
+                offset += FLAG_VALUE.size
+    
+    except struct.error as e:
+        raise ValueError(f"save file is truncated ({e})")
+    
+    return SaveData(level, health, max_health, soul_embers, memory_fragments,
+                    (bench_x, bench_y) if has_bench else None, rooms, flags)
+
+
+class SaveSystem:
+    """Loads a save slot and writes it back without blocking the game loop"""
+    
+    def __init__(self, path="saves/slot1.sav"):
+        """Initialize save slot"""
+        self.path = path
+        self.pending = queue.Queue()
+        self.thread = None
+    
+    def load(self):
+        """Read the save slot, returns SaveData or None"""
+        if not os.path.exists(self.path):
+            return None
+        
+        try:
+            with open(self.path, 'rb') as f:
+                return decode_save(f.read())
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            print(f"Error loading save: {e}")
+            return None
+    
+    def save(self, save):
+        """Encode now (a consistent snapshot) and write on the background thread"""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.write_saves, name="save-writer", daemon=True)
+            self.thread.start()
+        
+        self.pending.put(encode_save(save))
+    
+    def write_saves(self):
+        """Writer thread - write queued saves as they arrive"""
+        while True:
+            data = self.pending.get()
+            written = 1
+            
+            # Only the newest save matters if several piled up
+            while not self.pending.empty():
+                data = self.pending.get_nowait()
+                written += 1
+            
+            try:
+                self.write_atomic(data)
+            except OSError as e:
+                print(f"Error writing save: {e}")
+            
+            for _ in range(written):
+                self.pending.task_done()
+    
+    def write_atomic(self, data):
+        """Write to a temp file, fsync, then rename over the slot"""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        os.replace(temp_path, self.path)
+        
+        # Make the rename itself durable (not possible on Windows)
+        if hasattr(os, 'O_DIRECTORY'):
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+    
+    def flush(self):
+        """Wait for queued saves to reach the disk (on quit)"""
+        self.pending.join()
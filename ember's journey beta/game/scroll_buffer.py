@@ -0,0 +1,89 @@
+"""
+Scroll Buffer - Reuses the static world layer across frames
+"""
+
+import pygame
+
+
+class ScrollBuffer:
+    """Oversized view buffer that only redraws strips exposed by camera movement"""
+    
+    def __init__(self, view_width, view_height, padding=32, colorkey=(255, 0, 255)):
+        """Initialize buffer covering the view plus padding on every side"""
+        self.view_width = view_width
+        self.view_height = view_height
+        self.padding = padding
+        self.colorkey = colorkey
+        
+        self.width = view_width + padding * 2
+        self.height = view_height + padding * 2
+        self.buffer = pygame.Surface((self.width, self.height))
+        if pygame.display.get_surface() is not None:
+            self.buffer = self.buffer.convert()
+        self.buffer.set_colorkey(colorkey)
+        
+        # World position of the buffer's top-left corner (None = needs full redraw)
+        self.origin = None
+    
+    def invalidate(self):
+        """Force a full redraw on the next frame (level load, changed tiles)"""
+        self.origin = None
+    
+    def draw(self, surface, camera_x, camera_y, draw_region):
+        """Blit the static layer for the view, redrawing only newly exposed strips
+        
+        draw_region(target, offset_x, offset_y, world_rect) must draw everything
+        intersecting world_rect onto target, shifted by -offset.
+        """
+        if self.origin is None:
+            self.redraw_all(camera_x, camera_y, draw_region)
+        else:
+            origin_x, origin_y = self.origin
+            view_inside = (origin_x <= camera_x and camera_x + self.view_width <= origin_x + self.width and
+                           origin_y <= camera_y and camera_y + self.view_height <= origin_y + self.height)
+            
+            if not view_inside:
+                self.recenter(camera_x, camera_y, draw_region)
+        
+        origin_x, origin_y = self.origin
+        area = (camera_x - origin_x, camera_y - origin_y, self.view_width, self.view_height)
+        surface.blit(self.buffer, (0, 0), area)
+    
+    def redraw_all(self, camera_x, camera_y, draw_region):
+        """Redraw the whole buffer centered on the view"""
+        self.origin = (camera_x - self.padding, camera_y - self.padding)
+        self.redraw_strip(pygame.Rect(0, 0, self.width, self.height), draw_region)
+    
+    def recenter(self, camera_x, camera_y, draw_region):
+        """Scroll the buffer to center the view and redraw the exposed rows and columns"""
+        old_x, old_y = self.origin
+        new_x, new_y = camera_x - self.padding, camera_y - self.padding
+        dx, dy = new_x - old_x, new_y - old_y
+        
+        # Large jumps expose everything anyway
+        if abs(dx) >= self.width or abs(dy) >= self.height:
+            self.redraw_all(camera_x, camera_y, draw_region)
+            return
+        
+        self.buffer.scroll(-dx, -dy)
+        self.origin = (new_x, new_y)
+        
+        # Exposed columns
+        if dx > 0:
+            self.redraw_strip(pygame.Rect(self.width - dx, 0, dx, self.height), draw_region)
+        elif dx < 0:
+            self.redraw_strip(pygame.Rect(0, 0, -dx, self.height), draw_region)
+        
+        # Exposed rows
+        if dy > 0:
+            self.redraw_strip(pygame.Rect(0, self.height - dy, self.width, dy), draw_region)
+        elif dy < 0:
+            self.redraw_strip(pygame.Rect(0, 0, self.width, -dy), draw_region)
+    
+    def redraw_strip(self, rect, draw_region):
+        """Clear and redraw one buffer-space rect"""
+        origin_x, origin_y = self.origin
+        self.buffer.set_clip(rect)
+        self.buffer.fill(self.colorkey)
+        draw_region(self.buffer, origin_x, origin_y, rect.move(origin_x, origin_y))
+        self.buffer.set_clip(None)
@@ -0,0 +1,49 @@
+"""
+Snapshots - In-memory checkpoints of the room and player for instant respawns
+"""
+
+import copy
+
+
+def copy_entity(entity):
+    """Shallow copy an entity with its own rect (its other state is plain values)"""
+    clone = copy.copy(entity)
+    clone.rect = entity.rect.copy()
+    return clone
+
+
+class Snapshot:
+    """Room and player state at a checkpoint
+    
+    Level data (tiles, spawns, layers, spatial indexes, baked lights) is never
+    modified after loading, so it is shared by reference rather than copied.
+    Live entities are copied once here and again on each restore, so the same
+    snapshot can be restored any number of times.
+    """
+    
+    def __init__(self, world_state, light_state, camera_state, player, enemies, npcs,
+                 collectibles, removed_spawns, stats, bench, flags, room_deltas):
+        self.world_state = world_state
+        self.light_state = light_state
+        self.camera_state = camera_state
+        self.player = copy_entity(player)
+        self.enemies = [copy_entity(enemy) for enemy in enemies]
+        self.npcs = [copy_entity(npc) for npc in npcs]
+        self.collectibles = list(collectibles)  # Pickup dicts are never modified
+        self.removed_spawns = frozenset(removed_spawns)
+        self.stats = stats  # (health, max health, soul embers, memory fragments)
+        self.bench = bench
+        self.flags = dict(flags)  # Dialogue script flags and counters
+        self.room_deltas = room_deltas  # Other rooms, as removed spawn ids only
+    
+    def get_player(self):
+        """Fresh copy of the saved player"""
+        return copy_entity(self.player)
+    
+    def get_enemies(self):
+        """Fresh copies of the saved enemies"""
+        return [copy_entity(enemy) for enemy in self.enemies]
+    
+    def get_npcs(self):
+        """Fresh copies of the saved NPCs"""
+        return [copy_entity(npc) for npc in self.npcs]
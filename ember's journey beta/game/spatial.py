@@ -0,0 +1,103 @@
+"""
+Spatial Index - Uniform grid hash for fast rectangle queries
+"""
+
+import pygame
+
+
+class SpatialHash:
+    """Buckets items into grid cells so area queries only visit nearby items"""
+    
+    def __init__(self, cell_size=64):
+        """Initialize an empty index"""
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> {item id: item}
+        self.entries = {}  # item id -> (insertion order, item, rect, cells)
+        self.next_order = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def clear(self):
+        """Remove all items"""
+        self.cells.clear()
+        self.entries.clear()
+        self.next_order = 0
+    
+    def get_cells(self, rect):
+        """Get the grid cells a rect overlaps"""
+        x, y, width, height = rect
+        size = self.cell_size
+        x0, y0 = int(x) // size, int(y) // size
+        x1 = int(x + max(width, 1) - 1) // size
+        y1 = int(y + max(height, 1) - 1) // size
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+    
+    def insert(self, item, rect):
+        """Add an item covering rect (x, y, width, height)"""
+        key = id(item)
+        if key in self.entries:
+            self.move(item, rect)
+            return
+        
+        cells = self.get_cells(rect)
+        for cell in cells:
+            self.cells.setdefault(cell, {})[key] = item
+        
+        self.entries[key] = (self.next_order, item, pygame.Rect(rect), cells)
+        self.next_order += 1
+    
+    def remove(self, item):
+        """Remove an item (ignored if not present)"""
+        entry = self.entries.pop(id(item), None)
+        if entry is None:
+            return
+        
+        for cell in entry[3]:
+            bucket = self.cells.get(cell)
+            if bucket is not None:
+                bucket.pop(id(item), None)
+                if not bucket:
+                    del self.cells[cell]
+    
+    def move(self, item, rect):
+        """Update an item's rect, only touching buckets if its cells changed"""
+        key = id(item)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.insert(item, rect)
+            return
+        
+        order, _, _, old_cells = entry
+        cells = self.get_cells(rect)
+        
+        if cells != old_cells:
+            for cell in old_cells:
+                bucket = self.cells.get(cell)
+                if bucket is not None:
+                    bucket.pop(key, None)
+                    if not bucket:
+                        del self.cells[cell]
+            for cell in cells:
+                self.cells.setdefault(cell, {})[key] = item
+        
+        self.entries[key] = (order, item, pygame.Rect(rect), cells)
+    
+    def query(self, rect):
+        """Get items whose rect intersects rect, in insertion order"""
+        query_rect = pygame.Rect(rect)
+        found = {}
+        
+        for cell in self.get_cells(query_rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        
+        hits = []
+        for key in found:
+            order, item, item_rect, _ = self.entries[key]
+            if item_rect.colliderect(query_rect):
+                hits.append((order, item))
+        
+        hits.sort(key=lambda hit: hit[0])
+        return [item for _, item in hits]
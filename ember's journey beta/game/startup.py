@@ -0,0 +1,51 @@
+"""
+Startup Profile - Time to first frame broken down by startup phase (--startup-profile)
+"""
+
+import time
+
+
+class StartupProfile:
+    """Times startup phases up to the first frame shown, then the first level load
+    
+    Font loading happens inside other phases (menu setup, first draw), so
+    it is taken out of whichever phase it fell in and reported on its own.
+    """
+    
+    def __init__(self, start_time):
+        """Start timing from start_time (perf_counter, taken before the imports)"""
+        self.start_time = start_time
+        self.last_time = start_time
+        self.phases = []  # (name, seconds)
+        self.fonts = None  # FontManager, set once it exists
+        self.font_time = 0
+        self.level_name = None
+        self.level_start = None
+    
+    def mark(self, name):
+        """End a phase - the time since the previous mark, less font loading"""
+        now = time.perf_counter()
+        font_time = self.fonts.get_load_time() if self.fonts else 0
+        self.phases.append((name, now - self.last_time - (font_time - self.font_time)))
+        self.font_time = font_time
+        self.last_time = now
+    
+    def report(self):
+        """Print the time to first frame by phase"""
+        print(f"Startup profile - first frame after {(self.last_time - self.start_time) * 1000:.1f} ms")
+        for name, seconds in self.phases + [("fonts", self.font_time)]:
+            print(f"  {name:<12} {seconds * 1000:7.1f} ms")
+    
+    def start_level(self, name):
+        """Start timing the first level load (only the first one is reported)"""
+        if self.level_start is None:
+            self.level_name = name
+            self.level_start = time.perf_counter()
+    
+    def finish_level(self, name):
+        """Print the first level's load time"""
+        if self.level_name != name:
+            return
+        print(f"  level        {(time.perf_counter() - self.level_start) * 1000:7.1f} ms "
+              f"({name}, loaded after the menu)")
+        self.level_name = None
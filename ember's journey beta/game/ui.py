@@ -4,11 +4,33 @@ UI System - HUD, menus, and on-screen displays
 
 import pygame
 
+
+class HUDWidget:
+    """HUD element that re-renders its cached surface only when its value changes"""
+    
+    def __init__(self, position, render):
+        """Initialize widget with a position and a render(value) -> Surface callback"""
+        self.position = position
+        self.render = render
+        self.value = None
+        self.surface = None
+    
+    def bind(self, value):
+        """Bind a new value, returns True if the surface was re-rendered"""
+        if self.surface is not None and value == self.value:
+            return False
+        
+        self.value = value
+        self.surface = self.render(value)
+        return True
+
+
 class UI:
     """User interface and HUD"""
     
-    def __init__(self):
-        """Initialize UI"""
+    def __init__(self, fonts):
+        """Initialize UI with the shared FontManager"""
+        self.fonts = fonts
         self.font_small = None
         self.font_medium = None
         self.font_large = None
@@ -26,39 +48,68 @@ class UI:
         
         # Notification system
         self.notifications = []
+        
+        # Retained HUD (built on first draw)
+        self.widgets = []
+        self.hud_surface = None
+    
+    def load_fonts(self):
+        """Load HUD fonts and build the retained widgets (first use only)"""
+        if self.font_small:
+            return
+        
+        self.font_small = self.fonts.get(14)
+        self.font_medium = self.fonts.get(18)
+        self.font_large = self.fonts.get(24)
+        
+        # Widgets hold their last rendered surface until the bound value changes
+        self.health_widget = HUDWidget((5, 5), self.render_health)
+        self.ember_widget = HUDWidget(
+            (200, 5), lambda value: self.render_counter("Soul Embers", value, self.ember_color))
+        self.fragment_widget = HUDWidget(
+            (200, 20), lambda value: self.render_counter("Fragments", value, self.fragment_color))
+        self.widgets = [self.health_widget, self.ember_widget, self.fragment_widget]
     
     def draw(self, surface, health, max_health, soul_embers, memory_fragments):
         """Draw the HUD"""
-        if not self.font_small:
-            self.font_small = pygame.font.Font(None, 14)
-            self.font_medium = pygame.font.Font(None, 18)
-            self.font_large = pygame.font.Font(None, 24)
+        self.load_fonts()
         
-        # Draw health (hearts in top-left)
-        self.draw_health(surface, health, max_health)
+        # Re-render only the widgets whose values changed
+        changed = self.health_widget.bind((health, max_health))
+        changed = self.ember_widget.bind(soul_embers) or changed
+        changed = self.fragment_widget.bind(memory_fragments) or changed
         
-        # Draw soul embers count (top-right)
-        self.draw_counter(surface, "Soul Embers", soul_embers, self.ember_color, 200, 5)
+        if changed or self.hud_surface is None:
+            self.compose_hud(surface.get_width())
         
-        # Draw memory fragments (top-right, below embers)
-        self.draw_counter(surface, "Fragments", memory_fragments, self.fragment_color, 200, 20)
+        # Steady frames cost a single blit
+        surface.blit(self.hud_surface, (0, 0))
         
         # Draw notifications
         self.draw_notifications(surface)
     
-    def draw_health(self, surface, health, max_health):
-        """Draw health hearts"""
-        x = 5
-        y = 5
+    def compose_hud(self, width):
+        """Compose all widget surfaces into the cached HUD surface"""
+        height = max(w.position[1] + w.surface.get_height() for w in self.widgets)
+        
+        if self.hud_surface is None or self.hud_surface.get_size() != (width, height):
+            self.hud_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        
+        self.hud_surface.fill((0, 0, 0, 0))
+        for widget in self.widgets:
+            self.hud_surface.blit(widget.surface, widget.position)
+    
+    def render_health(self, value):
+        """Render health hearts to a new surface"""
+        health, max_health = value
+        width = max(1, (max_health - 1) * self.heart_spacing + self.heart_size + 1)
+        surface = pygame.Surface((width, self.heart_size + 1), pygame.SRCALPHA)
         
         for i in range(max_health):
-            # Draw heart (simplified as rectangle for now)
-            if i < health:
-                # Full heart
-                self.draw_heart(surface, x + i * self.heart_spacing, y, True)
-            else:
-                # Empty heart
-                self.draw_heart(surface, x + i * self.heart_spacing, y, False)
+            # Full heart if i < health, otherwise empty outline
+            self.draw_heart(surface, i * self.heart_spacing, 0, i < health)
+        
+        return surface
     
     def draw_heart(self, surface, x, y, filled):
         """Draw a heart shape (simplified)"""
@@ -83,46 +134,54 @@ class UI:
             ]
             pygame.draw.polygon(surface, (100, 100, 100), points, 2)
     
-    def draw_counter(self, surface, label, value, color, x, y):
-        """Draw a labeled counter"""
-        # Draw shadow
-        shadow_text = self.font_small.render(f"{label}: {value}", True, self.shadow_color)
-        surface.blit(shadow_text, (x + 1, y + 1))
-        
-        # Draw text
-        text = self.font_small.render(f"{label}: {value}", True, color)
-        surface.blit(text, (x, y))
+    def render_counter(self, label, value, color):
+        """Render a labeled counter (with shadow) to a new surface"""
+        text = f"{label}: {value}"
+        shadow_text = self.font_small.render(text, True, self.shadow_color)
+        fill_text = self.font_small.render(text, True, color)
+        
+        surface = pygame.Surface(
+            (fill_text.get_width() + 1, fill_text.get_height() + 1), pygame.SRCALPHA)
+        surface.blit(shadow_text, (1, 1))
+        surface.blit(fill_text, (0, 0))
+        return surface
+    
+    def update(self, dt):
+        """Count notification timers down (every frame, even while the HUD is hidden)"""
+        for notification in self.notifications[:]:
+            notification['timer'] -= dt
+            if notification['timer'] <= 0:
+                self.notifications.remove(notification)
     
     def draw_notifications(self, surface):
         """Draw notification messages"""
         y_offset = 40
         
-        for notification in self.notifications[:]:
-            # Draw centered notification
-            text = self.font_medium.render(notification['text'], True, notification['color'])
-            text_rect = text.get_rect(center=(160, y_offset))
-            
-            # Draw background
-            bg_rect = text_rect.inflate(10, 5)
-            pygame.draw.rect(surface, (0, 0, 0, 180), bg_rect)
-            pygame.draw.rect(surface, notification['color'], bg_rect, 2)
-            
-            # Draw text
-            surface.blit(text, text_rect)
-            
-            # Update timer
-            notification['timer'] -= 1/60  # Assuming 60 FPS
-            if notification['timer'] <= 0:
-                self.notifications.remove(notification)
-            
+        for notification in self.notifications:
+            # Panel was rendered once in show_notification
+            panel = notification['surface']
+            surface.blit(panel, panel.get_rect(center=(160, y_offset)))
             y_offset += 20
     
+    def render_notification(self, text, color):
+        """Render a notification panel (background, border, text) once"""
+        text_surface = self.font_medium.render(text, True, color)
+        bg_rect = text_surface.get_rect().inflate(10, 5)
+        
+        panel = pygame.Surface(bg_rect.size)
+        panel.fill((0, 0, 0))
+        pygame.draw.rect(panel, color, panel.get_rect(), 2)
+        panel.blit(text_surface, text_surface.get_rect(center=panel.get_rect().center))
+        return panel
+    
     def show_notification(self, text, color=(255, 255, 255), duration=2.0):
         """Show a notification message"""
+        self.load_fonts()
         self.notifications.append({
             'text': text,
             'color': color,
-            'timer': duration
+            'timer': duration,
+            'surface': self.render_notification(text, color)
         })
     
     def draw_interact_prompt(self, surface, text="Press S to Interact"):
@@ -3,17 +3,64 @@ World System - Level loading, tile management, and collision
 """
 
 import pygame
-import json
-import os
+from game.spatial import SpatialHash
+from game.scroll_buffer import ScrollBuffer
+from game.resources import resources
+
+# Attributes that make up a loaded level (see World.get_level_state)
+LEVEL_STATE_FIELDS = (
+    'current_level', 'level_path', 'level_width', 'level_height', 'map_position', 'music',
+    'tiles', 'collision_tiles', 'spawns', 'interactive_objects', 'transitions',
+    'background_layers', 'tile_index', 'object_index'
+)
+
+
+class ParallaxLayer:
+    """Background layer that scrolls at a fraction of the camera speed"""
+    
+    def __init__(self, image, parallax, view_width, y=0, opaque=False):
+        """Pre-tile the image into a display-format strip at least view_width wide"""
+        self.parallax = parallax
+        self.y = y
+        self.opaque = opaque
+        self.tile_width = image.get_width()
+        
+        # Enough copies to cover the view, so drawing needs at most two blits
+        copies = max(1, -(-view_width // self.tile_width))
+        flags = 0 if opaque else pygame.SRCALPHA
+        strip = pygame.Surface((self.tile_width * copies, image.get_height()), flags)
+        for i in range(copies):
+            strip.blit(image, (i * self.tile_width, 0))
+        
+        # Convert once so blits never need a pixel format conversion
+        if pygame.display.get_surface() is not None:
+            strip = strip.convert() if opaque else strip.convert_alpha()
+        self.strip = strip
+    
+    def draw(self, surface, camera_x, camera_y):
+        """Draw the layer by wrapping the scaled camera offset"""
+        offset = int(camera_x * self.parallax) % self.tile_width
+        y = self.y - int(camera_y * self.parallax)
+        
+        surface.blit(self.strip, (-offset, y))
+        
+        # Wrap around with a second blit if the strip ends inside the view
+        right = self.strip.get_width() - offset
+        if right < surface.get_width():
+            surface.blit(self.strip, (right, y))
+
 
 class World:
     """Manages level data, tiles, and collision"""
     
-    def __init__(self):
+    def __init__(self, use_scroll_buffer=True):
         """Initialize world"""
         self.current_level = None
+        self.level_path = None  # Source file of the current level (None if procedural)
         self.level_width = 320
         self.level_height = 180
+        self.map_position = None  # Optional [x, y] in tiles on the world map
+        self.music = None  # Music track name (assets/music), None keeps the previous room's
         
         # Tile data
         self.tiles = []  # All tiles in the level
@@ -29,6 +76,21 @@ class World:
         # Level transitions
         self.transitions = []
         
+        # Spatial indexes for view culling
+        self.tile_index = SpatialHash()
+        self.object_index = SpatialHash()
+        
+        # Parallax background layers (back to front)
+        self.background_layers = []
+        self.parallax_limit = None  # Max decorative layers drawn (None = all, quality setting)
+        self.view_width = 320
+        self.view_height = 180
+        
+        # Optional scroll buffer for the static layer (tiles and objects)
+        self.scroll_buffer = None
+        if use_scroll_buffer:
+            self.scroll_buffer = ScrollBuffer(self.view_width, self.view_height)
+        
         # Colors for placeholder tiles
         self.tile_colors = {
             'floor': (74, 85, 104),  # Dark gray
@@ -38,43 +100,130 @@ class World:
         }
     
     def load_level(self, level_name):
-        """Load a level from data or create procedurally"""
-        self.current_level = level_name
+        """Load a level from data or create procedurally (all at once)"""
+        for _ in self.apply_level(self.read_level(level_name)):
+            pass
+    
+    def read_level(self, level_name):
+        """Read a level's data and decode its background images (safe on a loader thread)
         
-        # Try to load from JSON file
+        Returns (level_name, path, data, images) for apply_level - data is None
+        if the level has no file, images are (layer entry, decoded Surface) pairs.
+        Layer entries are {'image': path, 'parallax': factor, 'y': 0, 'opaque': False},
+        listed from back to front (placeholder layers are made if there are none).
+        """
         level_path = f"data/levels/{level_name}.json"
+        if not resources.exists(level_path):
+            return level_name, level_path, None, []
         
-        if os.path.exists(level_path):
-            self.load_from_file(level_path)
-        else:
+        try:
+            data = resources.load_json(level_path)
+        except (OSError, ValueError) as e:
+            print(f"Error loading level: {e}")
+            return level_name, level_path, None, []
+        
+        images = []
+        for entry in data.get('background_layers') or []:
+            try:
+                with resources.open(entry['image']) as f:
+                    images.append((entry, pygame.image.load(f, entry['image'])))
+            except (pygame.error, OSError, KeyError) as e:
+                print(f"Error loading background layer: {e}")
+        
+        return level_name, level_path, data, images
+    
+    def apply_level(self, level):
+        """Switch to a level read by read_level (main thread)
+        
+        A generator - each step converts one background layer to display
+        format, so a loader can spread the work over several frames.
+        """
+        level_name, level_path, data, images = level
+        self.current_level = level_name
+        self.level_path = None
+        self.map_position = None
+        self.music = None
+        
+        if data is None:
             # Create a basic level procedurally for testing
             self.create_test_level(level_name)
+        else:
+            try:
+                self.load_from_data(data)
+                self.level_path = level_path
+            except Exception as e:
+                print(f"Error loading level: {e}")
+                self.create_test_level(level_name)
+                images = None
+            
+            if images is not None:
+                self.background_layers = []
+                if not data.get('background_layers'):
+                    self.create_placeholder_layers()
+                for entry, image in images:
+                    yield
+                    self.background_layers.append(ParallaxLayer(
+                        image,
+                        entry.get('parallax', 0.5),
+                        self.view_width,
+                        entry.get('y', 0),
+                        entry.get('opaque', False)
+                    ))
+        
+        self.build_spatial_index()
+        
+        if self.scroll_buffer:
+            self.scroll_buffer.invalidate()
     
-    def load_from_file(self, filepath):
-        """Load level from JSON file"""
-        try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            
-            self.level_width = data.get('width', 320)
-            self.level_height = data.get('height', 180)
-            self.tiles = data.get('tiles', [])
-            self.collision_tiles = [t for t in self.tiles if t.get('collision', False)]
-            self.spawns = data.get('spawns', [])
-            self.interactive_objects = data.get('interactive_objects', [])
-            self.transitions = data.get('transitions', [])
-            
-        except Exception as e:
-            print(f"Error loading level: {e}")
-            self.create_test_level(self.current_level)
+    def build_spatial_index(self):
+        """Index tiles and interactive objects by position for culling"""
+        # New indexes rather than clearing, so level state captured earlier stays valid
+        self.tile_index = SpatialHash()
+        for tile in self.tiles:
+            self.tile_index.insert(tile, (tile['x'], tile['y'], tile['width'], tile['height']))
+        
+        self.object_index = SpatialHash()
+        for obj in self.interactive_objects:
+            self.object_index.insert(obj, self.get_object_rect(obj))
+    
+    def get_level_state(self):
+        """Everything describing the loaded level (shared, never modified after loading)"""
+        return {name: getattr(self, name) for name in LEVEL_STATE_FIELDS}
+    
+    def set_level_state(self, state):
+        """Switch back to a level captured with get_level_state without reloading it"""
+        for name, value in state.items():
+            setattr(self, name, value)
+        
+        if self.scroll_buffer:
+            self.scroll_buffer.invalidate()
+    
+    def get_object_rect(self, obj):
+        """Get the drawn area of an interactive object"""
+        if obj['type'] == 'bench':
+            return pygame.Rect(obj['x'], obj['y'], 32, 16)
+        return pygame.Rect(obj['x'], obj['y'], obj.get('width', 16), obj.get('height', 16))
+    
+    def load_from_data(self, data):
+        """Set up the level from its parsed JSON (background layers are added by apply_level)"""
+        self.level_width = data.get('width', 320)
+        self.level_height = data.get('height', 180)
+        self.tiles = data.get('tiles', [])
+        self.collision_tiles = [t for t in self.tiles if t.get('collision', False)]
+        self.spawns = data.get('spawns', [])
+        self.interactive_objects = data.get('interactive_objects', [])
+        self.transitions = data.get('transitions', [])
+        self.map_position = data.get('map_position')
+        self.music = data.get('music')
     
     def create_test_level(self, level_name):
         """Create a simple test level"""
-        self.tiles.clear()
-        self.collision_tiles.clear()
-        self.spawns.clear()
-        self.interactive_objects.clear()
-        self.transitions.clear()
+        # Fresh lists - the previous level's may still be held by a snapshot
+        self.tiles = []
+        self.collision_tiles = []
+        self.spawns = []
+        self.interactive_objects = []
+        self.transitions = []
         
         if level_name == "tutorial_chamber":
             # Set level size
@@ -187,6 +336,36 @@ class World:
                     'y': 200,
                     'variant': 'hollow_soldier'
                 })
+        
+        self.background_layers = []
+        self.create_placeholder_layers()
+    
+    def create_placeholder_layers(self):
+        """Create simple silhouette layers until background art is available"""
+        # (parallax, pillar color, pillar width, spacing, opaque)
+        layer_specs = [
+            (0.2, (34, 37, 60), 12, 48, True),
+            (0.5, (40, 44, 70), 20, 96, False)
+        ]
+        
+        for parallax, color, pillar_width, spacing, opaque in layer_specs:
+            # Tall enough to cover the view across the whole vertical scroll range
+            height = self.view_height + int(max(0, self.level_height - self.view_height) * parallax)
+            tile_width = spacing * 4
+            
+            if opaque:
+                image = pygame.Surface((tile_width, height))
+                image.fill(self.tile_colors['background'])
+            else:
+                image = pygame.Surface((tile_width, height), pygame.SRCALPHA)
+            
+            # Pillars of varying height rising from the bottom
+            for i in range(4):
+                pillar_height = height // 2 + (i * 37) % (height // 3)
+                pygame.draw.rect(image, color,
+                               (i * spacing + spacing // 4, height - pillar_height, pillar_width, pillar_height))
+            
+            self.background_layers.append(ParallaxLayer(image, parallax, self.view_width, 0, opaque))
     
     def get_collision_tiles(self):
         """Get all tiles with collision"""
@@ -204,31 +383,57 @@ class World:
         """Get all level transitions"""
         return self.transitions
     
-    def draw(self, surface, camera_x, camera_y):
-        """Draw the level"""
-        # Draw background color
-        surface.fill(self.tile_colors['background'])
+    def draw(self, surface, camera_x, camera_y, view_rect=None):
+        """Draw the level (only tiles and objects intersecting view_rect)"""
+        if view_rect is None:
+            view_rect = pygame.Rect(camera_x, camera_y, surface.get_width(), surface.get_height())
         
-        # Draw all tiles
-        for tile in self.tiles:
+        # Draw parallax background, starting at the topmost opaque layer
+        first_layer = 0
+        for i, layer in enumerate(self.background_layers):
+            if layer.opaque:
+                first_layer = i
+        
+        if not self.background_layers or not self.background_layers[first_layer].opaque:
+            # Draw background color
+            surface.fill(self.tile_colors['background'])
+        
+        # Decorative layers over the base are dropped farthest first on lower quality
+        layers = self.background_layers[first_layer:]
+        if self.parallax_limit is not None and layers:
+            base = layers[:1] if layers[0].opaque else []
+            decorations = layers[len(base):]
+            layers = base + decorations[max(0, len(decorations) - self.parallax_limit):]
+        
+        for layer in layers:
+            layer.draw(surface, camera_x, camera_y)
+        
+        # Draw static layer - reused from the scroll buffer when it matches the view
+        if self.scroll_buffer and surface.get_size() == (self.view_width, self.view_height):
+            self.scroll_buffer.draw(surface, camera_x, camera_y, self.draw_static)
+        else:
+            self.draw_static(surface, camera_x, camera_y, view_rect)
+    
+    def draw_static(self, surface, camera_x, camera_y, view_rect):
+        """Draw tiles and interactive objects intersecting view_rect"""
+        # Draw visible tiles
+        for tile in self.tile_index.query(view_rect):
             screen_x = tile['x'] - camera_x
             screen_y = tile['y'] - camera_y
             
-            # Only draw if on screen
-            if -16 <= screen_x <= 320 and -16 <= screen_y <= 180:
-                tile_type = tile.get('type', 'floor')
-                color = self.tile_colors.get(tile_type, (100, 100, 100))
-                
-                pygame.draw.rect(surface, color, 
-                               (screen_x, screen_y, tile['width'], tile['height']))
-                
-                # Draw border for visibility
-                border_color = tuple(max(0, c - 20) for c in color)
-                pygame.draw.rect(surface, border_color,
-                               (screen_x, screen_y, tile['width'], tile['height']), 1)
-        
-        # Draw interactive objects
-        for obj in self.interactive_objects:
+            tile_type = tile.get('type', 'floor')
+            color = self.tile_colors.get(tile_type, (100, 100, 100))
+            
+            pygame.draw.rect(surface, color, 
+                           (screen_x, screen_y, tile['width'], tile['height']))
+            
+            # Draw border for visibility
+            border_color = tuple(max(0, c - 20) for c in color)
+            pygame.draw.rect(surface, border_color,
+                           (screen_x, screen_y, tile['width'], tile['height']), 1)
+        
+        # Draw visible interactive objects
+        for obj in self.object_index.query(view_rect):
             screen_x = obj['x'] - camera_x
             screen_y = obj['y'] - camera_y
             
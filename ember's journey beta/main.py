@@ -3,7 +3,14 @@ Ember's Journey - Main Game File
 A Hollow Knight-inspired 2D Adventure
 """
 
+import time
+
+# Taken before the other imports so --startup-profile can time them
+STARTUP_TIME = time.perf_counter()
+
 import pygame
+import argparse
+import os
 import sys
 from game.player import Player
 from game.enemy import Enemy
@@ -12,7 +19,22 @@ from game.world import World
 from game.camera import Camera
 from game.ui import UI
 from game.dialogue import DialogueSystem
+from game.dialogue_store import DialogueStore
 from game.menu import Menu
+from game.fonts import FontManager
+from game.spatial import SpatialHash
+from game.capture import FrameCapture
+from game.pacing import FramePacer, PACING_MODES
+from game.input import InputSystem
+from game.quality import QualityGovernor, QUALITY_FEATURES
+from game.save import SaveSystem, SaveData
+from game.audio import AudioSystem
+from game.cutscene import CutscenePlayer, ImageSequence, MemoryFlash, CUTSCENE_DIR
+from game.resources import resources, get_path
+from game.loader import AssetLoader
+from game.startup import StartupProfile
+from game.snapshot import Snapshot
+from game.rooms import RoomCache, RoomState
 
 # Game Constants
 SCREEN_WIDTH = 1280
@@ -20,7 +42,10 @@ SCREEN_HEIGHT = 720
 BASE_WIDTH = 320
 BASE_HEIGHT = 180
 SCALE = 4  # 320x180 scaled to 1280x720
-FPS = 60
+DEFAULT_FPS = 60  # Target frame rate unless --fps is given
+CONTROLS_PATH = get_path("config/controls.json")  # Optional key and gamepad rebinding
+SETTINGS_PATH = get_path("config/settings.json")  # Saved from the settings screen
+SAVE_PATH = get_path("saves/slot1.sav")
 
 # Colors
 BLACK = (0, 0, 0)
@@ -29,134 +54,411 @@ WHITE = (255, 255, 255)
 class Game:
     """Main game class managing all game states and systems"""
     
-    def __init__(self):
-        """Initialize the game"""
-        pygame.init()
-        pygame.mixer.init()
+    def __init__(self, headless=False, capture=None, pacer=None, startup_profile=None):
+        """Initialize the game
+        
+        headless renders into game_surface only (no window, scaling or present).
+        capture is an optional FrameCapture that receives every rendered frame.
+        pacer is the FramePacer driving the main loop.
+        startup_profile is an optional StartupProfile, reported after the first frame.
+        """
+        self.startup_profile = startup_profile
+        self.headless = headless
+        if pacer is None:
+            # Headless batch runs never wait
+            pacer = FramePacer("uncapped", idle_fps=0) if headless else FramePacer()
+        self.pacer = pacer
+        if headless:
+            # SDL dummy drivers - nothing is shown or played
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        
+        # Only what the menu needs - the mixer opens when audio is first used and
+        # InputSystem starts the joystick module (small mixer buffer so sound
+        # effects land on the frame they're played)
+        pygame.mixer.pre_init(44100, -16, 2, 512)
+        pygame.display.init()
+        pygame.font.init()
+        if startup_profile:
+            startup_profile.mark("pygame.init")
         
-        # Display setup
+        # Display setup (headless still needs a display surface for convert())
         self.fullscreen = False
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if headless:
+            self.screen = pygame.display.set_mode((BASE_WIDTH, BASE_HEIGHT))
+        else:
+            self.screen = self.set_display_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Ember's Journey")
+        if startup_profile:
+            startup_profile.mark("display")
         
         # Create a surface for base resolution (will be scaled up)
         self.game_surface = pygame.Surface((BASE_WIDTH, BASE_HEIGHT))
         
-        # Clock for FPS
-        self.clock = pygame.time.Clock()
+        # Frame time report on exit (--frame-stats)
+        self.show_frame_stats = False
+        
+        # Optional frame capture (written out on its own thread). The headless
+        # fixed-step loop waits for the writer rather than dropping frames
+        self.capture = capture
+        if capture:
+            if headless:
+                capture.blocking = True
+            capture.start()
         
         # Game state
         self.running = True
         self.paused = False
-        self.current_state = "MENU"  # MENU, PLAYING, CUTSCENE, ENDING
+        self.current_state = "MENU"  # MENU, LOADING, PLAYING, CUTSCENE, ENDING
+        
+        # Modal scene stack - (name, backdrop) pairs. While a modal is open the
+        # frame underneath is frozen into the backdrop and only the modal is drawn
+        self.modal_stack = []
         
-        # Initialize game systems
-        self.menu = Menu()
+        # Background loading (headless runs finish each load at once, for reproducible output)
+        self.loader = AssetLoader(blocking=headless)
+        self.loading_batch = None  # Batch shown on the loading screen
+        self.loading_generation = 0  # Bumped by every load, so a replaced load's results are dropped
+        self.state_after_loading = None
+        
+        # Initialize game systems - everything slow is deferred to first use
+        # (fonts bake glyphs as text is drawn, audio opens on the first sound,
+        # dialogue is read with the first level, which loads on Start/Continue)
+        self.input = InputSystem()
+        self.input.load_bindings(CONTROLS_PATH)
+        self.fonts = FontManager()
+        if startup_profile:
+            startup_profile.fonts = self.fonts
+        self.audio = AudioSystem(loader=self.loader)
+        self.menu = Menu(self.fonts)
         self.menu.show("MAIN")  # Show main menu on start
         self.world = World()
         self.camera = Camera(BASE_WIDTH, BASE_HEIGHT)
         self.player = Player(50, 100)
-        self.ui = UI()
-        self.dialogue_system = DialogueSystem()
+        self.ui = UI(self.fonts)
+        self.dialogue_store = DialogueStore()
+        self.dialogue_system = DialogueSystem(self.fonts, self.dialogue_store)
+        # Particles, lighting and the minimap (the numpy users) are created on first gameplay use
+        self.particles = None
+        self.lighting = None
+        self.minimap = None
+        self.cutscene = CutscenePlayer(self.audio)
+        self.pending_cutscene = None  # Started once the frame's pickups are done
+        self.ambient_timer = 0
+        
+        # Adaptive quality (levels can be pinned from the settings screen)
+        self.quality = QualityGovernor(self.pacer.target_fps)
+        self.quality.load_settings(SETTINGS_PATH)
+        self.scaler = "nearest"
+        self.ai_lod_interval = 1  # Off-screen enemies update every Nth frame
+        self.update_count = 0
+        self.present_time = 0  # Time spent presenting the last frame (excluded from work time)
+        self.apply_quality()
         
         # Game entities
         self.enemies = []
         self.npcs = []
         self.collectibles = []
         
+        # Spatial indexes for culling (enemies are re-indexed as they move)
+        self.enemy_index = SpatialHash()
+        self.npc_index = SpatialHash()
+        self.collectible_index = SpatialHash()
+        
         # Player stats
         self.health = 3
         self.max_health = 3
         self.soul_embers = 0
         self.memory_fragments = 0
         
-        # Initialize first level
-        self.load_level("tutorial_chamber")
+        # Progress - last bench rested at and spawn ids removed from the current room
+        self.bench = None
+        self.removed_spawns = set()
+        
+        # Recently left rooms, kept live so re-entering them is instant
+        self.rooms = RoomCache()
+        
+        # In-memory checkpoint restored on death and restart
+        self.checkpoint = None
+        
+        # Save slot (read now, so Continue is instant)
+        self.save_system = SaveSystem(SAVE_PATH)
+        self.save_data = self.save_system.load()
+        self.refresh_main_menu_options()
+        
+        if startup_profile:
+            startup_profile.mark("systems")
+        
+    def load_level(self, level_name, then=None):
+        """Enter a level - at once from the room cache if it's live there, else loaded in the background
+        
+        then is called once the level has been entered. A load still in
+        progress is cancelled - the newest load wins.
+        """
+        self.cancel_loading()
+        if self.startup_profile:
+            self.startup_profile.start_level(level_name)
+        self.start_gameplay_systems()
+        
+        room = self.rooms.take(level_name)
+        if room:
+            self.world.set_level_state(room.world_state)
+            self.lighting.set_static_state(room.light_state)
+            self.enemies = room.enemies
+            self.npcs = room.npcs
+            self.collectibles = room.collectibles
+            self.removed_spawns = room.removed_spawns
+            self.enter_level()
+            if then:
+                then()
+            return
+        
+        # The level is read on a worker and converted over the next frames while
+        # the loading screen shows progress, so the window never stops responding
+        self.state_after_loading = self.current_state
+        self.current_state = "LOADING"
+        self.loading_generation += 1
+        generation = self.loading_generation
+        self.loading_batch = self.loader.start(lambda: self.finish_loading(level_name, then, generation))
+        self.loader.submit(self.loading_batch, self.world.read_level, level_name,
+                           finish=self.world.apply_level)
+        self.loader.submit(self.loading_batch, self.dialogue_store.load_index)
+        self.loader.update()
+    
+    def start_gameplay_systems(self):
+        """Import and create the systems only gameplay needs (once, before the first level)"""
+        if self.particles is not None:
+            return
+        
+        from game.particles import ParticleSystem
+        from game.lighting import LightingSystem
+        from game.minimap import MinimapSystem
+        
+        self.particles = ParticleSystem()
+        self.lighting = LightingSystem(BASE_WIDTH, BASE_HEIGHT)
+        self.minimap = MinimapSystem()
+        self.apply_quality()
+    
+    def finish_loading(self, level_name, then, generation):
+        """Spawn the loaded level's entities and enter it (unless a newer load replaced it)"""
+        if generation != self.loading_generation:
+            return
+        
+        self.spawn_level(level_name)
+        self.enter_level()
+        if self.startup_profile:
+            self.startup_profile.finish_level(level_name)
+        
+        self.current_state = self.state_after_loading
+        self.loading_batch = None
+        self.menu.invalidate()
+        self.pacer.reset()  # Don't try to catch up on the load's last slow frames
+        if then:
+            then()
+    
+    def cancel_loading(self):
+        """Drop the level load in progress, if any (its callbacks never run)"""
+        if self.loading_batch is None:
+            return
         
-    def load_level(self, level_name):
-        """Load a level and spawn entities"""
-        self.world.load_level(level_name)
+        self.loader.cancel(self.loading_batch)
+        self.loading_batch = None
+        self.loading_generation += 1
+        self.current_state = self.state_after_loading
+    
+    def enter_level(self):
+        """Set up camera, indexes, music and minimap for the level now in the world"""
         self.camera.set_bounds(
             self.world.level_width,
             self.world.level_height
         )
+        self.particles.clear()
+        self.build_entity_indexes()
+        self.audio.play_music(self.world.music)
         
-        # Clear existing entities
-        self.enemies.clear()
-        self.npcs.clear()
-        self.collectibles.clear()
+        # Room map (rasterised once, explored state is kept per room)
+        self.minimap.enter_room(self.world)
+    
+    def spawn_level(self, level_name):
+        """Spawn the loaded level's entities (except removed spawn ids - killed, collected)"""
+        # Fresh lists - the old ones may be kept in the room cache
+        self.enemies = []
+        self.npcs = []
+        self.collectibles = []
         
-        # Spawn entities based on level data
-        for spawn in self.world.get_spawns():
+        # Spawn entities based on level data (spawn ids are indexes into the spawn list)
+        self.removed_spawns = set(self.rooms.get_removed(level_name))
+        for spawn_id, spawn in enumerate(self.world.get_spawns()):
+            if spawn_id in self.removed_spawns:
+                continue
+            
             if spawn['type'] == 'enemy':
                 enemy = Enemy(spawn['x'], spawn['y'], spawn.get('variant', 'hollow_soldier'))
+                enemy.spawn_id = spawn_id
                 self.enemies.append(enemy)
             elif spawn['type'] == 'npc':
-                npc = NPC(spawn['x'], spawn['y'], spawn.get('npc_id', 'scribe'))
+                npc_id = spawn.get('npc_id', 'scribe')
+                npc = NPC(spawn['x'], spawn['y'], npc_id, self.dialogue_store.get_npc(npc_id))
                 self.npcs.append(npc)
             elif spawn['type'] == 'collectible':
-                self.collectibles.append(spawn)
+                self.collectibles.append(dict(spawn, spawn_id=spawn_id))
+        
+        # Benches never move, so their glow is baked once per level
+        self.lighting.bake_static_lights(
+            (obj['x'] + 16, obj['y'] + 8, 40, (255, 150, 60))
+            for obj in self.world.get_interactive_objects() if obj['type'] == 'bench'
+        )
+    
+    def leave_level(self):
+        """Keep the current room live in the room cache"""
+        # Mid-load the world holds a room that was never entered (the room
+        # before it was stored when that load started)
+        if self.loading_batch is not None:
+            return
+        
+        self.rooms.store(self.world.current_level, RoomState(
+            self.world.get_level_state(),
+            self.lighting.get_static_state(),
+            self.enemies,
+            self.npcs,
+            self.collectibles,
+            self.removed_spawns
+        ))
+    
+    def get_removed_spawns(self):
+        """Removed spawn ids for every room, including the current one"""
+        removed = self.rooms.get_all_removed()
+        removed[self.world.current_level] = frozenset(self.removed_spawns)
+        return removed
+    
+    def build_entity_indexes(self):
+        """Rebuild the spatial indexes from the current entity lists"""
+        self.enemy_index.clear()
+        for enemy in self.enemies:
+            self.enemy_index.insert(enemy, enemy.rect)
+        
+        self.npc_index.clear()
+        for npc in self.npcs:
+            self.npc_index.insert(npc, npc.rect)
+        
+        self.collectible_index.clear()
+        for collectible in self.collectibles:
+            self.collectible_index.insert(collectible, self.get_collectible_rect(collectible))
+    
+    def get_collectible_color(self, collectible):
+        """Placeholder color for a collectible type"""
+        return (6, 182, 212) if collectible['item_type'] == 'memory_fragment' else (249, 115, 22)
+    
+    def get_collectible_rect(self, collectible):
+        """Area covered by a collectible's pickup box and its drawn circle"""
+        return pygame.Rect(collectible['x'] - 4, collectible['y'] - 4, 20, 20)
     
     def handle_events(self):
-        """Handle input events"""
-        for event in pygame.event.get():
+        """Sample input and handle every press made since the last frame"""
+        for event in self.input.poll():
             if event.type == pygame.QUIT:
                 self.running = False
             
-            if event.type == pygame.KEYDOWN:
-                # F11 for fullscreen toggle (works anywhere)
-                if event.key == pygame.K_F11:
-                    self.toggle_fullscreen()
-                    return
-                
-                # Handle menu navigation
-                if self.current_state == "MENU" and self.menu.active:
-                    self.handle_menu_input(event.key)
-                    return
-                
-                # ESC for pause menu
-                if event.key == pygame.K_ESCAPE:
-                    if self.current_state == "PLAYING":
-                        if not self.paused:
-                            self.paused = True
-                            self.menu.show("PAUSE")
-                        else:
-                            self.paused = False
-                            self.menu.hide()
-                    return
-                
-                # Handle pause menu input
-                if self.paused and self.menu.active:
-                    self.handle_menu_input(event.key)
-                    return
-                
-                # Handle dialogue advancement
-                if self.dialogue_system.is_active():
-                    if event.key in [pygame.K_s, pygame.K_DOWN, pygame.K_SPACE]:
-                        self.dialogue_system.advance()
-                    return  # Don't process other inputs while dialogue is active
-                
-                # Player input
-                if not self.paused and self.current_state == "PLAYING":
-                    if event.key in [pygame.K_SPACE, pygame.K_w]:
-                        self.player.jump()
-                    elif event.key in [pygame.K_j, pygame.K_z]:
-                        self.player.attack()
-                    elif event.key in [pygame.K_s, pygame.K_DOWN]:
-                        self.interact()
-    
-    def handle_menu_input(self, key):
+            if event.type == pygame.WINDOWEXPOSED:
+                # Window contents were lost - present the cached menu again
+                self.menu.invalidate()
+        
+        for press in self.input.presses:
+            self.handle_press(press)
+    
+    def handle_press(self, press):
+        """Handle one key or button press (an InputPress of bound actions)"""
+        # F11 for fullscreen toggle (works anywhere)
+        if 'fullscreen' in press:
+            self.toggle_fullscreen()
+            return
+        
+        # Nothing else until loading is done
+        if self.current_state == "LOADING":
+            return
+        
+        # Handle menu navigation
+        if self.current_state == "MENU" and self.menu.active:
+            self.handle_menu_input(press)
+            return
+        
+        # Confirm or ESC skips a cutscene
+        if self.cutscene.is_playing():
+            if 'confirm' in press or 'pause' in press:
+                self.end_cutscene()
+            return
+        
+        # M or ESC closes the world map
+        if self.is_map_open():
+            if 'map' in press or 'pause' in press:
+                self.close_map()
+            return
+        
+        # ESC for pause menu
+        if 'pause' in press:
+            if self.current_state == "PLAYING":
+                if not self.paused:
+                    self.pause_game()
+                else:
+                    self.resume_game()
+            return
+        
+        # Handle pause menu input
+        if self.paused and self.menu.active:
+            self.handle_menu_input(press)
+            return
+        
+        # Handle dialogue choices (S is also Down, so only confirm picks an option)
+        if self.dialogue_system.is_choosing():
+            if 'up' in press:
+                self.dialogue_system.move_choice(-1)
+            elif 'down' in press:
+                self.dialogue_system.move_choice(1)
+            elif 'confirm' in press:
+                self.dialogue_system.advance()
+                if not self.dialogue_system.is_active():
+                    self.pop_modal("DIALOGUE")
+            return
+        
+        # Handle dialogue advancement
+        if self.dialogue_system.is_active():
+            if 'interact' in press or 'confirm' in press:
+                self.dialogue_system.advance()
+                if not self.dialogue_system.is_active():
+                    self.pop_modal("DIALOGUE")
+            return  # Don't process other inputs while dialogue is active
+        
+        # Player input (jump and attack are buffered and applied in update)
+        if not self.paused and self.current_state == "PLAYING":
+            if 'jump' in press:
+                self.input.buffer('jump', press.time)
+            elif 'attack' in press:
+                self.input.buffer('attack', press.time)
+            elif 'interact' in press:
+                self.interact()
+            elif 'map' in press:
+                self.open_map()
+    
+    def handle_menu_input(self, press):
         """Handle menu navigation"""
-        if key in [pygame.K_UP, pygame.K_w]:
+        if 'up' in press:
             self.menu.navigate_up()
-        elif key in [pygame.K_DOWN, pygame.K_s]:
+            self.audio.play('menu_select')
+        elif 'down' in press:
             self.menu.navigate_down()
-        elif key in [pygame.K_RETURN, pygame.K_SPACE]:
+            self.audio.play('menu_select')
+        elif 'confirm' in press:
             self.select_menu_option()
-        elif key == pygame.K_ESCAPE:
+        elif 'pause' in press:
             if self.menu.menu_type == "PAUSE":
-                self.paused = False
-                self.menu.hide()
+                self.resume_game()
+            elif self.menu.menu_type == "SETTINGS":
+                self.close_settings()
+        elif self.menu.menu_type == "SETTINGS":
+            if 'left' in press:
+                self.change_setting(-1)
+            elif 'right' in press:
+                self.change_setting(1)
     
     def select_menu_option(self):
         """Handle menu option selection"""
@@ -164,39 +466,234 @@ class Game:
         
         if option == "Start Game":
             self.start_game()
+        elif option == "Continue":
+            self.continue_game()
         elif option == "Resume":
-            self.paused = False
-            self.menu.hide()
+            self.resume_game()
         elif option == "Restart":
             self.restart_game()
         elif option == "Main Menu":
             self.return_to_main_menu()
+        elif option == "Settings":
+            self.open_settings()
+        elif option == "Back":
+            self.close_settings()
         elif option == "Quit":
             self.running = False
+        elif self.menu.menu_type == "SETTINGS":
+            self.change_setting(1)
+    
+    def open_settings(self):
+        """Show the settings screen"""
+        self.menu.show("SETTINGS")
+        self.refresh_settings_options()
+    
+    def close_settings(self):
+        """Return from the settings screen to the main menu"""
+        self.menu.show("MAIN")
+        self.menu.selected_index = self.menu.main_menu_options.index("Settings")
+    
+    def refresh_settings_options(self):
+        """Update settings screen labels from the current settings"""
+        self.menu.settings_options = [self.quality.get_setting_label(feature) for feature in QUALITY_FEATURES]
+        self.menu.settings_options.append("Back")
+    
+    def change_setting(self, direction):
+        """Cycle the selected setting and save it"""
+        features = list(QUALITY_FEATURES)
+        if self.menu.selected_index >= len(features):
+            return
+        
+        self.quality.cycle_setting(features[self.menu.selected_index], direction)
+        self.quality.save_settings(SETTINGS_PATH)
+        self.refresh_settings_options()
+        self.apply_quality()
+    
+    def apply_quality(self):
+        """Push the current quality levels to the systems they control"""
+        if self.particles is not None:
+            self.particles.density = self.quality.get('particles')
+            self.lighting.set_resolution(self.quality.get('lighting'))
+        self.world.parallax_limit = self.quality.get('parallax')
+        self.ai_lod_interval = self.quality.get('ai_lod')
+        self.scaler = self.quality.get('scaler')
+        self.quality.changed = False
+    
+    def pause_game(self):
+        """Open the pause menu over a frozen, dimmed gameplay frame"""
+        self.paused = True
+        self.audio.play('pause')
+        self.menu.show("PAUSE")
+        self.push_modal("PAUSE", self.menu.pause_dim_alpha)
+    
+    def resume_game(self):
+        """Close the pause menu and resume gameplay"""
+        self.paused = False
+        self.menu.hide()
+        self.pop_modal("PAUSE")
+    
+    def open_map(self):
+        """Open the world map over a frozen, dimmed gameplay frame"""
+        self.push_modal("MAP", 160)
+    
+    def close_map(self):
+        """Close the world map"""
+        self.pop_modal("MAP")
+    
+    def is_map_open(self):
+        """Check if the world map is the top modal"""
+        return bool(self.modal_stack) and self.modal_stack[-1][0] == "MAP"
+    
+    def push_modal(self, name, dim_alpha=0):
+        """Open a modal scene, snapshotting the current frame once as its backdrop"""
+        backdrop = pygame.Surface(self.game_surface.get_size())
+        self.draw_scene(backdrop)
+        
+        # Presses made before the modal opened shouldn't fire after it closes
+        self.input.clear_buffer()
+        
+        # Dimming is applied once here instead of every frame
+        if dim_alpha:
+            dim = pygame.Surface(backdrop.get_size())
+            dim.set_alpha(dim_alpha)
+            dim.fill(BLACK)
+            backdrop.blit(dim, (0, 0))
+        
+        self.modal_stack.append((name, backdrop))
+    
+    def pop_modal(self, name):
+        """Close the topmost modal scene with this name"""
+        for i in range(len(self.modal_stack) - 1, -1, -1):
+            if self.modal_stack[i][0] == name:
+                del self.modal_stack[i]
+                return
+    
+    def play_cutscene(self, name):
+        """Suspend gameplay for a cutscene (assets/cutscenes/<name>/, else a memory flash)"""
+        directory = f"{CUTSCENE_DIR}/{name}"
+        if resources.is_dir(directory):
+            source = ImageSequence(directory)
+        else:
+            source = MemoryFlash(self.camera.apply(self.player.rect).center, (BASE_WIDTH, BASE_HEIGHT))
+        
+        self.push_modal("CUTSCENE")
+        self.cutscene.play(source)
+    
+    def end_cutscene(self):
+        """Stop the cutscene and resume gameplay"""
+        self.cutscene.stop()
+        self.pop_modal("CUTSCENE")
     
     def start_game(self):
         """Start a new game"""
         self.current_state = "PLAYING"
+        self.modal_stack.clear()
         self.menu.hide()
         # Reset game state
         self.health = self.max_health
         self.soul_embers = 0
         self.memory_fragments = 0
-        self.load_level("tutorial_chamber")
+        self.bench = None
+        self.dialogue_system.variables = {}
+        self.player.rect.x = 50
+        self.player.rect.y = 100
+        self.rooms.reset()
+        self.load_level("tutorial_chamber", then=self.set_start_checkpoint)
+    
+    def continue_game(self):
+        """Resume from the save slot at the bench it was made at"""
+        save = self.save_data
+        self.current_state = "PLAYING"
+        self.modal_stack.clear()
+        self.menu.hide()
+        
+        self.max_health = save.max_health
+        self.health = save.health
+        self.soul_embers = save.soul_embers
+        self.memory_fragments = save.memory_fragments
+        self.bench = save.bench
+        self.dialogue_system.variables = dict(save.flags)
+        self.rooms.reset(save.rooms)
+        self.load_level(save.level, then=self.set_start_checkpoint)
+    
+    def set_start_checkpoint(self):
+        """Checkpoint where the game starts (at the last bench, if there is one)"""
+        if self.bench:
+            self.place_player_at_bench()
+        self.checkpoint = self.capture_snapshot()
+    
+    def capture_snapshot(self):
+        """Capture the room and player in memory"""
+        return Snapshot(
+            self.world.get_level_state(),
+            self.lighting.get_static_state(),
+            self.camera.get_state(),
+            self.player,
+            self.enemies,
+            self.npcs,
+            self.collectibles,
+            self.removed_spawns,
+            (self.health, self.max_health, self.soul_embers, self.memory_fragments),
+            self.bench,
+            self.dialogue_system.variables,
+            self.rooms.get_all_removed()
+        )
+    
+    def restore_snapshot(self, snapshot):
+        """Put the room and player back as captured (no disk access or respawning)"""
+        self.world.set_level_state(snapshot.world_state)
+        self.lighting.set_static_state(snapshot.light_state)
+        self.camera.set_bounds(self.world.level_width, self.world.level_height)
+        self.camera.set_state(snapshot.camera_state)
+        self.minimap.enter_room(self.world)
+        self.audio.play_music(self.world.music)
+        
+        self.player = snapshot.get_player()
+        self.enemies = snapshot.get_enemies()
+        self.npcs = snapshot.get_npcs()
+        self.collectibles = list(snapshot.collectibles)
+        self.removed_spawns = set(snapshot.removed_spawns)
+        self.health, self.max_health, self.soul_embers, self.memory_fragments = snapshot.stats
+        self.bench = snapshot.bench
+        self.dialogue_system.variables = dict(snapshot.flags)
+        
+        # Rooms visited since the checkpoint go back to how they were then
+        self.rooms.reset(snapshot.room_deltas)
+        
+        self.build_entity_indexes()
+        self.particles.clear()
+        self.input.clear_buffer()
+    
+    def place_player_at_bench(self):
+        """Stand the player on the last bench"""
+        bench_x, bench_y = self.bench
+        self.player.rect.centerx = bench_x + 16
+        self.player.rect.bottom = bench_y + 16
+        self.player.velocity_x = 0
+        self.player.velocity_y = 0
+        self.camera.update(self.player)
+    
+    def refresh_main_menu_options(self):
+        """Offer Continue when there is a save to continue from"""
+        options = ["Start Game", "Settings", "Quit"]
+        if self.save_data:
+            options.insert(0, "Continue")
+        self.menu.main_menu_options = options
     
     def restart_game(self):
-        """Restart current level"""
+        """Restart from the last checkpoint (bench, or the start of the game)"""
         self.paused = False
+        self.modal_stack.clear()
+        self.dialogue_system.close()
         self.menu.hide()
-        self.health = self.max_health
-        self.player.rect.x = 50
-        self.player.rect.y = 100
-        self.load_level("tutorial_chamber")
+        self.restore_snapshot(self.checkpoint)
     
     def return_to_main_menu(self):
         """Return to main menu"""
         self.current_state = "MENU"
         self.paused = False
+        self.modal_stack.clear()
+        self.dialogue_system.close()
         self.menu.show("MAIN")
     
     def interact(self):
@@ -204,35 +701,81 @@ class Game:
         # Check for nearby NPCs
         for npc in self.npcs:
             if npc.is_near_player(self.player):
-                self.dialogue_system.start_dialogue(npc.dialogue_id)
+                self.dialogue_system.start_dialogue(npc.dialogue_id, game_values={
+                    'memory_fragments': self.memory_fragments,
+                    'soul_embers': self.soul_embers
+                })
+                if self.dialogue_system.is_active():
+                    self.push_modal("DIALOGUE")
                 return
         
         # Check for benches
         for obj in self.world.get_interactive_objects():
             if obj['type'] == 'bench':
                 if abs(self.player.rect.centerx - obj['x']) < 30:
-                    self.save_game()
                     self.health = self.max_health
+                    self.bench = (obj['x'], obj['y'])
+                    self.audio.play('bench_sit')
+                    self.checkpoint = self.capture_snapshot()
+                    self.save_game()
                     return
     
     def save_game(self):
-        """Save game progress"""
-        # TODO: Implement save system
-        print("Game saved!")
+        """Save game progress (written on a background thread)"""
+        self.save_data = SaveData(
+            level=self.world.current_level,
+            health=self.health,
+            max_health=self.max_health,
+            soul_embers=self.soul_embers,
+            memory_fragments=self.memory_fragments,
+            bench=self.bench,
+            rooms=self.get_removed_spawns(),
+            flags=dict(self.dialogue_system.variables)
+        )
+        self.save_system.save(self.save_data)
+        self.refresh_main_menu_options()
+        self.ui.show_notification("Game Saved", (255, 150, 60))
+    
+    def set_display_mode(self, size, flags=0):
+        """Open the window, requesting vsync when the pacer is in vsync mode"""
+        if self.pacer.mode == "vsync":
+            try:
+                # SDL only honors vsync for renderer-backed (SCALED) windows
+                return pygame.display.set_mode(size, flags | pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print(f"VSync unavailable ({e}), using the frame limiter")
+                self.pacer.mode = "limit"
+        
+        return pygame.display.set_mode(size, flags)
+    
+    def is_idle(self):
+        """Check if only a menu is on screen (frame rate can be capped to save power)"""
+        return self.current_state == "MENU" or self.paused
     
     def toggle_fullscreen(self):
         """Toggle between fullscreen and windowed mode"""
+        if self.headless:
+            return
+        
         self.fullscreen = not self.fullscreen
         
         if self.fullscreen:
             # Get desktop resolution
             display_info = pygame.display.Info()
-            self.screen = pygame.display.set_mode((display_info.current_w, display_info.current_h), pygame.FULLSCREEN)
+            self.screen = self.set_display_mode((display_info.current_w, display_info.current_h), pygame.FULLSCREEN)
         else:
-            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            self.screen = self.set_display_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        
+        self.menu.invalidate()
     
     def update(self, dt):
         """Update game logic"""
+        if self.quality.changed:
+            self.apply_quality()
+        
+        # Notifications time out behind menus and modals too
+        self.ui.update(dt)
+        
         # Update menu if active
         if self.current_state == "MENU" or self.paused:
             self.menu.update(dt)
@@ -241,66 +784,137 @@ class Game:
         if self.current_state != "PLAYING":
             return
         
+        # Cutscenes suspend gameplay until they finish
+        if self.cutscene.is_playing():
+            self.cutscene.update(dt)
+            if not self.cutscene.is_playing():
+                self.pop_modal("CUTSCENE")
+            return
+        
         # Update dialogue system first
         self.dialogue_system.update(dt)
         
-        # Don't update gameplay if dialogue is active
-        if self.dialogue_system.is_active():
+        # Don't update gameplay if dialogue or the world map is open
+        if self.dialogue_system.is_active() or self.is_map_open():
             return
         
-        # Get keyboard input
-        keys = pygame.key.get_pressed()
+        # Buffered actions fire as soon as the player is able to
+        if self.input.is_buffered('jump') and self.player.jump():
+            self.input.consume('jump')
+            self.audio.play('jump')
+        if self.input.is_buffered('attack') and self.player.attack():
+            self.input.consume('attack')
+            self.audio.play('sword_swing')
         
         # Player update
-        self.player.update(dt, keys, self.world.get_collision_tiles())
+        was_airborne = not self.player.on_ground
+        self.player.update(dt, self.input.get_move_direction(), self.world.get_collision_tiles())
+        
+        # Landing dust
+        if was_airborne and self.player.on_ground:
+            self.particles.emit(self.player.rect.centerx, self.player.rect.bottom, 'dust', 8, spread=4)
         
-        # Update enemies
-        for enemy in self.enemies[:]:
-            enemy.update(dt, self.player, self.world.get_collision_tiles())
+        # Update enemies (off-screen ones less often on lower AI quality)
+        self.update_count += 1
+        active_rect = self.camera.visible_rect(margin=64)
+        for i, enemy in enumerate(self.enemies[:]):
+            enemy_dt = dt
+            if self.ai_lod_interval > 1 and not enemy.rect.colliderect(active_rect):
+                enemy.lod_dt += dt
+                # Staggered so skipped enemies don't all update on the same frame
+                if (self.update_count + i) % self.ai_lod_interval:
+                    continue
+                enemy_dt = enemy.lod_dt
+            enemy.lod_dt = 0
+            
+            enemy.update(enemy_dt, self.player, self.world.get_collision_tiles())
+            self.enemy_index.move(enemy, enemy.rect)
             
             # Check player attacks hitting enemies
             if self.player.is_attacking and enemy.check_hit(self.player.get_attack_rect()):
+                self.particles.emit(enemy.rect.centerx, enemy.rect.centery, 'spark', 6)
+                self.audio.play('sword_hit')
+                
                 if enemy.take_damage(1):  # Enemy died
+                    self.audio.play('hollow_death')
                     self.enemies.remove(enemy)
+                    self.enemy_index.remove(enemy)
+                    self.removed_spawns.add(enemy.spawn_id)
                     self.soul_embers += 2  # Drop soul embers
+                    
+                    # Dissolve the body and release the embers
+                    self.particles.emit(enemy.rect.centerx, enemy.rect.centery, 'dissolve', 60,
+                                        color=enemy.color, spread=8)
+                    self.particles.emit(enemy.rect.centerx, enemy.rect.centery, 'ember', 20)
             
             # Check enemy attacks hitting player
             if enemy.is_attacking and enemy.check_player_hit(self.player.rect):
                 self.take_damage(1)
+                if self.health <= 0:
+                    break
+        
+        # Died this frame - respawn before anything else touches the old room
+        if self.health <= 0:
+            self.game_over()
+            return
         
         # Update NPCs
         for npc in self.npcs:
             npc.update(dt)
         
-        # Check collectible pickups
-        for collectible in self.collectibles[:]:
+        # Check collectible pickups (only those near the player)
+        for collectible in self.collectible_index.query(self.player.rect):
             if self.player.rect.colliderect(
                 pygame.Rect(collectible['x'], collectible['y'], 16, 16)
             ):
                 self.collect_item(collectible)
                 self.collectibles.remove(collectible)
+                self.collectible_index.remove(collectible)
+                self.removed_spawns.add(collectible['spawn_id'])
+                self.particles.emit(collectible['x'], collectible['y'], 'ember', 24,
+                                    color=self.get_collectible_color(collectible))
+        
+        # Memory flash, once the fragment has left the room
+        if self.pending_cutscene:
+            self.play_cutscene(self.pending_cutscene)
+            self.pending_cutscene = None
+            return
         
         # Update camera to follow player
         self.camera.update(self.player)
         
+        # Reveal the map around the player
+        self.minimap.update(self.player.rect)
+        
+        # Ambient glow from visible pickups
+        self.ambient_timer += dt
+        if self.ambient_timer >= 0.15:
+            self.ambient_timer = 0
+            for collectible in self.camera.cull(self.collectible_index):
+                self.particles.emit(collectible['x'], collectible['y'], 'glow', 1,
+                                    color=self.get_collectible_color(collectible), spread=3)
+        
+        # Update particles
+        self.particles.update(dt)
+        
         # Check for level transitions
         self.check_level_transitions()
     
     def take_damage(self, amount):
-        """Player takes damage"""
+        """Player takes damage (death is handled once the enemy update finishes)"""
         self.health -= amount
         self.player.hurt()
-        
-        if self.health <= 0:
-            self.game_over()
+        self.audio.play('player_hurt')
     
     def collect_item(self, collectible):
         """Collect an item"""
         if collectible['item_type'] == 'soul_ember':
             self.soul_embers += 1
+            self.audio.play('collect_ember')
         elif collectible['item_type'] == 'memory_fragment':
             self.memory_fragments += 1
-            # TODO: Show memory flash cutscene
+            self.audio.play('collect_fragment')
+            self.pending_cutscene = f"memory_{self.memory_fragments}"
             print(f"Memory Fragment collected! ({self.memory_fragments}/3)")
     
     def check_level_transitions(self):
@@ -309,63 +923,101 @@ class Game:
             if self.player.rect.colliderect(
                 pygame.Rect(transition['x'], transition['y'], transition['width'], transition['height'])
             ):
+                self.leave_level()
                 self.load_level(transition['target_level'])
                 self.player.rect.x = transition['spawn_x']
                 self.player.rect.y = transition['spawn_y']
                 break
     
     def game_over(self):
-        """Handle player death"""
-        # TODO: Implement respawn at last bench
+        """Handle player death - respawn from the last checkpoint"""
         print("Game Over!")
-        self.health = self.max_health
-        self.player.rect.x = 50
-        self.player.rect.y = 100
+        self.restore_snapshot(self.checkpoint)
+    
+    def draw_scene(self, surface):
+        """Draw the top modal over its frozen backdrop, or live gameplay"""
+        if self.modal_stack:
+            name, backdrop = self.modal_stack[-1]
+            surface.blit(backdrop, (0, 0))
+            
+            if name == "PAUSE":
+                self.menu.draw(surface)
+            elif name == "DIALOGUE":
+                self.dialogue_system.draw(surface)
+            elif name == "MAP":
+                self.minimap.draw_world_map(surface)
+            elif name == "CUTSCENE":
+                self.cutscene.draw(surface)
+        else:
+            self.draw_gameplay(surface)
+    
+    def draw_gameplay(self, surface):
+        """Draw the world, entities and HUD"""
+        # Get camera offset
+        cam_x, cam_y = self.camera.get_offset()
+        
+        # Draw world (background, tiles, platforms)
+        self.world.draw(surface, cam_x, cam_y, self.camera.visible_rect())
+        
+        # Draw visible collectibles
+        for collectible in self.camera.cull(self.collectible_index):
+            x = collectible['x'] - cam_x
+            y = collectible['y'] - cam_y
+            # Draw placeholder (will be replaced with sprites)
+            color = self.get_collectible_color(collectible)
+            pygame.draw.circle(surface, color, (int(x), int(y)), 4)
+        
+        # Draw visible NPCs (margin covers glow and indicators drawn outside the rect)
+        for npc in self.camera.cull(self.npc_index, margin=8):
+            npc.draw(surface, cam_x, cam_y)
+        
+        # Draw visible enemies
+        for enemy in self.camera.cull(self.enemy_index, margin=8):
+            enemy.draw(surface, cam_x, cam_y)
+        
+        # Draw player
+        self.player.draw(surface, cam_x, cam_y)
+        
+        # Darkness and lights (the player's ember and glowing pickups)
+        lights = [(self.player.rect.centerx, self.player.rect.centery, 56, (255, 190, 120))]
+        for collectible in self.camera.cull(self.collectible_index, margin=16):
+            lights.append((collectible['x'], collectible['y'], 16, self.get_collectible_color(collectible)))
+        self.lighting.draw(surface, cam_x, cam_y, lights)
+        
+        # Draw particles (emissive, so drawn after lighting)
+        self.particles.draw(surface, cam_x, cam_y)
+        
+        # Draw UI (HUD)
+        self.ui.draw(surface, self.health, self.max_health, self.soul_embers, self.memory_fragments)
+        self.minimap.draw(surface)
     
     def draw(self):
         """Render everything"""
+        # An unchanged menu needs no redraw or present at all
+        if self.current_state == "MENU" and not self.menu.needs_redraw(self.game_surface.get_size()):
+            # game_surface still holds the last frame, so captures stay continuous
+            if self.capture:
+                self.capture.submit(self.game_surface)
+            self.pacer.set_presented(False)
+            return
+        
         # Clear the base surface
         self.game_surface.fill(BLACK)
         
         # Draw menu if in menu state
         if self.current_state == "MENU":
             self.menu.draw(self.game_surface)
+        elif self.current_state == "LOADING":
+            self.menu.draw_loading_screen(self.game_surface, self.loading_batch.get_progress())
         else:
-            # Get camera offset
-            cam_x, cam_y = self.camera.get_offset()
-            
-            # Draw world (background, tiles, platforms)
-            self.world.draw(self.game_surface, cam_x, cam_y)
-            
-            # Draw collectibles
-            for collectible in self.collectibles:
-                x = collectible['x'] - cam_x
-                y = collectible['y'] - cam_y
-                # Draw placeholder (will be replaced with sprites)
-                color = (6, 182, 212) if collectible['item_type'] == 'memory_fragment' else (249, 115, 22)
-                pygame.draw.circle(self.game_surface, color, (int(x), int(y)), 4)
-            
-            # Draw NPCs
-            for npc in self.npcs:
-                npc.draw(self.game_surface, cam_x, cam_y)
-            
-            # Draw enemies
-            for enemy in self.enemies:
-                enemy.draw(self.game_surface, cam_x, cam_y)
-            
-            # Draw player
-            self.player.draw(self.game_surface, cam_x, cam_y)
-            
-            # Draw UI (HUD, dialogue, menus)
-            self.ui.draw(self.game_surface, self.health, self.max_health, self.soul_embers, self.memory_fragments)
-            
-            # Draw dialogue if active
-            if self.dialogue_system.is_active():
-                self.dialogue_system.draw(self.game_surface)
-            
-            # Draw pause menu if paused
-            if self.paused:
-                self.menu.draw(self.game_surface)
+            self.draw_scene(self.game_surface)
+        
+        if self.capture:
+            self.capture.submit(self.game_surface)
+        
+        # Headless runs stop at the base surface
+        if self.headless:
+            return
         
         # Scale up the base surface to screen size
         screen_size = self.screen.get_size()
@@ -384,7 +1036,7 @@ class Game:
                 new_width = screen_size[0]
                 new_height = int(new_width / aspect_ratio)
             
-            scaled_surface = pygame.transform.scale(self.game_surface, (new_width, new_height))
+            scaled_surface = self.scale_frame((new_width, new_height))
             x_offset = (screen_size[0] - new_width) // 2
             y_offset = (screen_size[1] - new_height) // 2
             
@@ -392,36 +1044,138 @@ class Game:
             self.screen.blit(scaled_surface, (x_offset, y_offset))
         else:
             # Normal windowed mode
-            scaled_surface = pygame.transform.scale(self.game_surface, screen_size)
+            scaled_surface = self.scale_frame(screen_size)
             self.screen.blit(scaled_surface, (0, 0))
         
-        # Update display
+        # Update display (timed separately - vsync waits here)
+        present_start = time.perf_counter()
         pygame.display.flip()
+        self.present_time = time.perf_counter() - present_start
+        self.pacer.set_presented(True)
+    
+    def scale_frame(self, size):
+        """Scale the base surface up with the current scaler quality"""
+        if self.scaler == "scale2x":
+            # Two EPX passes (4x) smooth diagonal edges, then fit the exact size
+            frame = pygame.transform.scale2x(pygame.transform.scale2x(self.game_surface))
+            if frame.get_size() != size:
+                frame = pygame.transform.scale(frame, size)
+            return frame
+        
+        if self.scaler == "half":
+            # Through a half-size surface - two smaller scales are cheaper than one 4x,
+            # but pixels come out uneven unless the size is a multiple of the base
+            half = pygame.transform.scale(self.game_surface, (size[0] // 2, size[1] // 2))
+            return pygame.transform.scale(half, size)
+        
+        return pygame.transform.scale(self.game_surface, size)
     
-    def run(self):
-        """Main game loop"""
+    def run(self, max_frames=None):
+        """Main game loop (stops after max_frames if given)"""
+        frame = 0
         while self.running:
-            # Delta time in seconds
-            dt = self.clock.tick(FPS) / 1000.0
+            # Wait for the next frame (delta time in seconds)
+            self.pacer.set_idle(self.is_idle())
+            dt = self.pacer.tick()
+            
+            if self.headless:
+                # Batch rendering runs on a fixed step
+                dt = 1.0 / self.pacer.target_fps
+            
+            frame_start = time.perf_counter()
+            self.present_time = 0
             
-            # Handle events
+            # Sample input after the frame wait, right before simulating
             self.handle_events()
             
+            # Finish loaded assets within this frame's budget
+            self.loader.update()
+            
             # Update game state
             self.update(dt)
+            self.audio.update()
             
             # Draw everything
             self.draw()
+            
+            if self.startup_profile and frame == 0:
+                self.startup_profile.mark("first frame")
+                self.startup_profile.report()
+            
+            # Open the audio device in the background once the first frame is up
+            if frame == 0:
+                self.audio.start()
+            
+            # Adapt quality to gameplay frame cost (headless stays fixed for reproducible output)
+            if not self.headless and self.current_state == "PLAYING" and not self.modal_stack:
+                self.quality.update(dt, time.perf_counter() - frame_start - self.present_time)
+            
+            frame += 1
+            if max_frames is not None and frame >= max_frames:
+                self.running = False
         
         # Cleanup
+        self.save_system.flush()
+        self.loader.shutdown()
+        if self.capture:
+            self.capture.stop()
+        if self.show_frame_stats:
+            self.print_frame_stats()
         pygame.quit()
         sys.exit()
+    
+    def print_frame_stats(self):
+        """Report frame pacing over the most recent frames"""
+        stats = self.pacer.get_stats()
+        print(f"Frame pacing ({self.pacer.mode}, {stats['frames']} frames): "
+              f"{stats['fps']:.1f} fps, {stats['mean_ms']:.2f} ms mean, "
+              f"{stats['stddev_ms']:.2f} ms std dev, {stats['min_ms']:.2f}-{stats['max_ms']:.2f} ms")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Ember's Journey")
+    parser.add_argument("--headless", action="store_true",
+                        help="render offscreen with the SDL dummy drivers")
+    parser.add_argument("--capture", metavar="DIR",
+                        help="save every rendered frame into DIR")
+    parser.add_argument("--capture-format", choices=["png", "raw"], default="png",
+                        help="PNG sequence or a single raw RGB24 stream")
+    parser.add_argument("--frames", type=int, metavar="N",
+                        help="quit after N frames")
+    parser.add_argument("--pacing", choices=PACING_MODES, default="limit",
+                        help="vsync, precise frame limiter, or uncapped")
+    parser.add_argument("--fps", type=int, default=DEFAULT_FPS,
+                        help="target frame rate for the limiter (and headless time step)")
+    parser.add_argument("--menu-fps", type=int, default=30,
+                        help="power-saving frame cap in menus (0 disables it)")
+    parser.add_argument("--frame-stats", action="store_true",
+                        help="print frame time statistics on exit")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="print time to first frame by startup phase")
+    return parser.parse_args(argv)
 
 
 def main():
     """Entry point"""
-    game = Game()
-    game.run()
+    args = parse_args()
+    startup_profile = None
+    if args.startup_profile:
+        startup_profile = StartupProfile(STARTUP_TIME)
+        startup_profile.mark("import")
+    
+    capture = None
+    if args.capture:
+        capture = FrameCapture(args.capture, args.capture_format, args.fps)
+    
+    if args.headless:
+        pacer = FramePacer("uncapped", target_fps=args.fps, idle_fps=0)
+    else:
+        pacer = FramePacer(args.pacing, target_fps=args.fps, idle_fps=args.menu_fps)
+    
+    game = Game(headless=args.headless, capture=capture, pacer=pacer, startup_profile=startup_profile)
+    game.show_frame_stats = args.frame_stats
+    game.run(args.frames)
 
 
 if __name__ == "__main__":
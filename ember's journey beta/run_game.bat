@@ -14,7 +14,7 @@ if %errorlevel% neq 0 (
 
 echo.
 echo Installing dependencies...
-python -m pip install -r requirements.txt
+python -m pip install -r "%~dp0requirements.txt"
 
 echo.
 echo ========================================
@@ -22,6 +22,6 @@ echo   Launching Ember's Journey...
 echo ========================================
 echo.
 
-python main.py
+python "%~dp0main.py"
 
 pause